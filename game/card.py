@@ -1,29 +1,95 @@
+import operator
+
 from game.rank import Rank
 from game.suit import Suit
 
 
 class Card:
+    """
+    Immutable playing card.
+
+    There are only 37 distinct cards, so each one is created once and
+    shared: Card(rank, suit) always returns the same object for the
+    same rank and suit. Per-mission state (whether the card is done)
+    lives on the Task holding the card.
+
+    Each card has an integer code, suit * 9 + rank, used for hashing
+    and ordering. Sort with key=Card.key to avoid Python-level
+    comparisons.
+    """
 
-    def __init__(self, rank: Rank, suit: Suit):
-        self.rank = rank
-        self.suit = suit
-        self.done = False
+    __slots__ = ("rank", "suit", "code", "_str")
+
+    def __new__(cls, rank: Rank, suit: Suit):
+        code = suit.code * 9 + rank.code
+        card = _BY_CODE[code]
+        if card is not None:
+            return card
+        card = object.__new__(cls)
+        object.__setattr__(card, "rank", rank)
+        object.__setattr__(card, "suit", suit)
+        object.__setattr__(card, "code", code)
+        if suit is Suit.SPECIAL:
+            object.__setattr__(card, "_str", f"{suit.symbol}X")
+        else:
+            object.__setattr__(card, "_str", f"{suit.symbol}{rank.value}")
+        _BY_CODE[code] = card
+        return card
 
     @classmethod
     def special(cls):
-        return Card(Rank.NINE, Suit.SPECIAL)
+        return _SPECIAL
+
+    @classmethod
+    def from_code(cls, code: int) -> "Card":
+        card = _BY_CODE[code]
+        if card is None:
+            raise ValueError(f"no card with code {code}")
+        return card
+
+    key = operator.attrgetter("code")
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Card is immutable")
+
+    def __reduce__(self):
+        return (Card.from_code, (self.code,))
 
     def __repr__(self):
-        if self.suit == Suit.SPECIAL:
-            return f"{self.suit.symbol}X"
-        return f"{self.suit.symbol}{self.rank.value}"
+        return self._str
+
+    def __hash__(self):
+        return self.code
 
     def __eq__(self, other):
         if not isinstance(other, Card):
             return NotImplemented
-        return (self.suit, self.rank) == (other.suit, other.rank)
+        return self is other
 
     def __lt__(self, other):
         if not isinstance(other, Card):
             return NotImplemented
-        return (self.suit, self.rank) < (other.suit, other.rank)
+        return self.code < other.code
+
+
+N_CODES = len(Suit) * 9
+
+_BY_CODE: list[Card | None] = [None] * N_CODES
+
+COLOURED_SUITS = (Suit.SPADES, Suit.HEARTS, Suit.CLUBS, Suit.DIAMONDS)
+
+CARDS = tuple(Card(rank, suit) for suit in COLOURED_SUITS for rank in Rank)
+"""The 36 coloured cards, in sorted order."""
+
+ROCKETS = tuple(
+    Card(rank, Suit.ROCKET) for rank in (Rank.ONE, Rank.TWO, Rank.THREE, Rank.FOUR)
+)
+"""The 4 trump cards. Tasks never use these, but they're dealt for play."""
+
+_SPECIAL = Card(Rank.NINE, Suit.SPECIAL)
+
+SYMBOLS = [card and str(card) for card in _BY_CODE]
+"""Display string for each card code (None for unused codes)."""
+
+COLOURS = [card and card.suit.colour for card in _BY_CODE]
+"""Suit colour for each card code (None for unused codes)."""
@@ -1,22 +1,23 @@
 import random
 
-from game.card import Card
-from game.rank import Rank
-from game.suit import Suit
+from game.card import CARDS, Card
 
 
 class Deck:
 
-    def __init__(self):
+    def __init__(self, rng: random.Random | int | None = None):
+        if not isinstance(rng, random.Random):
+            rng = random.Random(rng)
+        self.rng = rng
         self.cards: list[Card] = []
         self.reset()
 
-    def reset(self):
-        self.cards.clear()
-        self.cards.extend(
-            Card(rank, suit) for rank in Rank for suit in Suit if suit != Suit.SPECIAL
-        )
-        random.shuffle(self.cards)
+    def reset(self, seed: int | None = None):
+        """Shuffle all cards back in, reseeding self.rng first if given a seed."""
+        if seed is not None:
+            self.rng.seed(seed)
+        self.cards[:] = CARDS
+        self.rng.shuffle(self.cards)
 
     def pop(self):
         if not self.cards:
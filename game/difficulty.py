@@ -0,0 +1,297 @@
+"""
+Monte Carlo estimate of how likely a mission is to succeed.
+
+Each playout deals the 36 coloured cards and 4 rockets to the players,
+then plays tricks with a simple greedy policy: follow suit when able,
+highest card of the led suit wins unless a rocket is played, and each
+player tries to win their own tasks and hand other players theirs. The
+mission fails as soon as a task card is won by someone other than its
+assignee. This is a rough guide, not an optimal player.
+
+Cards are plain ints (Card.code) here to keep playouts fast.
+"""
+
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+import math
+import os
+import random
+import threading
+import time
+
+from game.card import CARDS, ROCKETS
+from game.mission import Mission
+from game.players import BLANK_PLAYER
+from game.roster import Roster
+
+
+ROCKET = ROCKETS[0].code
+"""Codes from here up are rockets."""
+
+COMMANDER = ROCKETS[-1].code
+"""Whoever holds the 4 rocket leads the first trick."""
+
+DECK = tuple(card.code for card in CARDS + ROCKETS)
+
+BATCH_SIZE = 200
+
+
+def _suit(code: int):
+    return code // 9
+
+
+def beats(code: int, best: int, led: int):
+    """Whether code beats the currently winning card best, in suit led."""
+    if code >= ROCKET:
+        return best < ROCKET or code > best
+    return best < ROCKET and _suit(code) == led and code > best
+
+
+def _strength(code: int):
+    return (code >= ROCKET, code % 9)
+
+
+def deal(n_players: int, rng: random.Random) -> list[list[int]]:
+    deck = list(DECK)
+    rng.shuffle(deck)
+    return [sorted(deck[i::n_players]) for i in range(n_players)]
+
+
+def playout(hands: list[list[int]], tasks: list[tuple[int, int | None]]) -> bool:
+    """
+    Play out one deal, returning whether every task was completed.
+
+    tasks are (card code, player index) pairs. Unassigned tasks (player
+    None) are handed out in turn starting with the commander.
+    """
+    n_players = len(hands)
+    leader = next(i for i, hand in enumerate(hands) if COMMANDER in hand)
+    owners = task_owners(hands, tasks)
+    remaining = len(owners)
+    # With 3 players one hand has a spare card, left unplayed at the end
+    while remaining and all(hands):
+        trick: list[tuple[int, int]] = []
+        for offset in range(n_players):
+            player = (leader + offset) % n_players
+            if trick:
+                code = _follow(player, hands, trick, owners)
+            else:
+                code = _lead(player, hands, owners)
+            hands[player].remove(code)
+            trick.append((player, code))
+        leader = _winner(trick)
+        for _, code in trick:
+            owner = owners.get(code)
+            if owner is None:
+                continue
+            if owner != leader:
+                return False
+            remaining -= 1
+    return remaining == 0
+
+
+def task_owners(hands: list[list[int]], tasks: list[tuple[int, int | None]]):
+    """
+    Map task card codes to player indexes.
+
+    Unassigned tasks (player None) are handed out in turn starting with
+    the commander.
+    """
+    n_players = len(hands)
+    next_owner = next(i for i, hand in enumerate(hands) if COMMANDER in hand)
+    owners: dict[int, int] = {}
+    for code, owner in tasks:
+        if owner is None:
+            owner = next_owner
+            next_owner = (next_owner + 1) % n_players
+        owners[code] = owner
+    return owners
+
+
+def _winner(trick: list[tuple[int, int]]):
+    led = _suit(trick[0][1])
+    winner, best = trick[0]
+    for player, code in trick[1:]:
+        if beats(code, best, led):
+            winner, best = player, code
+    return winner
+
+
+def _lead(player: int, hands: list[list[int]], owners: dict[int, int]):
+    hand = hands[player]
+    others = {code for i, other in enumerate(hands) if i != player for code in other}
+
+    def highest(code: int, exclude: set[int] = set()):
+        suit = _suit(code)
+        return not any(
+            _suit(other) == suit and other > code
+            for other in others
+            if other not in exclude
+        )
+
+    # Cash a task card nobody can beat
+    for code in hand:
+        if owners.get(code) == player and code < ROCKET and highest(code):
+            return code
+    # Draw out a task card someone else is holding for us
+    suits = {_suit(code) for code, owner in owners.items() if owner == player}
+    for code in reversed(hand):
+        if code < ROCKET and code not in owners and _suit(code) in suits:
+            if highest(code) and any(_suit(other) in suits for other in others):
+                return code
+    # Give a task card to its owner, if they can win it
+    for code in hand:
+        owner = owners.get(code)
+        if owner is None or owner == player or code >= ROCKET:
+            continue
+        suit = _suit(code)
+        best = max((c for c in hands[owner] if _suit(c) == suit), default=-1)
+        if best > code and highest(best, exclude=set(hands[owner])):
+            return code
+    candidates = [code for code in hand if code not in owners and code < ROCKET]
+    return min(candidates or hand, key=_strength)
+
+
+def _follow(
+    player: int,
+    hands: list[list[int]],
+    trick: list[tuple[int, int]],
+    owners: dict[int, int],
+):
+    hand = hands[player]
+    led = _suit(trick[0][1])
+    legal = [code for code in hand if _suit(code) == led] or hand
+    winner, best = trick[0]
+    for other, code in trick[1:]:
+        if beats(code, best, led):
+            winner, best = other, code
+    wanted = next((owners[code] for _, code in trick if code in owners), None)
+    if wanted is None and any(owners.get(code) == player for code in legal):
+        wanted = player
+    if wanted is None:
+        # Nothing at stake yet, so hand over a task card if its owner is winning
+        wanted = winner
+
+    if wanted == player:
+        winning = [code for code in legal if beats(code, best, led)]
+        if winning:
+            return min(winning, key=_strength)
+    losing = [code for code in legal if not beats(code, best, led)]
+    if wanted is not None and wanted == winner:
+        gifts = [code for code in losing if owners.get(code) == wanted]
+        if gifts:
+            return gifts[0]
+    safe = [code for code in losing if code not in owners]
+    return min(safe or losing or legal, key=_strength)
+
+
+def run_batch(
+    n_players: int, tasks: list[tuple[int, int | None]], n_playouts: int, seed: int
+):
+    """Number of successful playouts out of n_playouts."""
+    rng = random.Random(seed)
+    return sum(playout(deal(n_players, rng), tasks) for _ in range(n_playouts))
+
+
+class Estimate:
+
+    def __init__(self, successes: int = 0, playouts: int = 0):
+        self.successes = successes
+        self.playouts = playouts
+
+    @property
+    def rate(self):
+        if self.playouts == 0:
+            return 0.0
+        return self.successes / self.playouts
+
+    def interval(self, z: float = 1.96):
+        """Wilson score interval, 95% by default."""
+        n = self.playouts
+        if n == 0:
+            return (0.0, 1.0)
+        p = self.rate
+        centre = (p + z * z / (2 * n)) / (1 + z * z / n)
+        margin = z * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n)) / (1 + z * z / n)
+        return (max(0.0, centre - margin), min(1.0, centre + margin))
+
+    def __str__(self):
+        low, high = self.interval()
+        return f"{self.rate:.0%} ({low:.0%}-{high:.0%}, n={self.playouts})"
+
+
+def mission_tasks(mission: Mission):
+    """Outstanding task cards in mission as (card code, player index) pairs."""
+    players = Roster(
+        player for player in mission.players if player is not BLANK_PLAYER
+    )
+    tasks = []
+    for task in mission.tasks:
+        if task.assignee is BLANK_PLAYER:
+            owner = None
+        else:
+            owner = players.index(task.assignee)
+        for i, card in enumerate(task.cards):
+            if card.code < len(CARDS) and not task.is_done(i):
+                tasks.append((card.code, owner))
+    return tasks
+
+
+def estimate(
+    n_players: int,
+    tasks: list[tuple[int, int | None]],
+    n_playouts: int = 20_000,
+    seed: int | None = None,
+    workers: int | None = None,
+    time_budget: float = 10.0,
+    cancel: threading.Event | None = None,
+):
+    """
+    Estimate the success rate of tasks with n_players players.
+
+    Playouts run in batches across a process pool (or in this process
+    if workers is 1). Stops early, returning what it has so far, once
+    time_budget seconds have passed or cancel is set.
+    """
+    if not 3 <= n_players <= 5:
+        raise ValueError(f"need 3 to 5 players, not {n_players}")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    rng = random.Random(seed)
+    deadline = time.monotonic() + time_budget
+    result = Estimate()
+
+    def stopped():
+        return time.monotonic() > deadline or (cancel is not None and cancel.is_set())
+
+    sizes = [BATCH_SIZE] * (n_playouts // BATCH_SIZE)
+    if n_playouts % BATCH_SIZE:
+        sizes.append(n_playouts % BATCH_SIZE)
+
+    if workers == 1:
+        for size in sizes:
+            if stopped():
+                break
+            result.successes += run_batch(n_players, tasks, size, rng.getrandbits(64))
+            result.playouts += size
+        return result
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending: dict[Future, int] = {}
+        while sizes or pending:
+            while sizes and len(pending) < 2 * workers and not stopped():
+                size = sizes.pop()
+                future = executor.submit(
+                    run_batch, n_players, tasks, size, rng.getrandbits(64)
+                )
+                pending[future] = size
+            if not pending:
+                break
+            done, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            for future in done:
+                result.successes += future.result()
+                result.playouts += pending.pop(future)
+            if stopped():
+                for future in pending:
+                    future.cancel()
+                break
+    return result
@@ -0,0 +1,234 @@
+"""
+Generate missions in bulk, without going through Mission one at a time.
+
+A batch of missions is a matrix of card codes (see Card.code), one row
+per mission. Each row is the concatenation of the mission's tasks,
+with the cards in each task sorted. NumPy is used when installed;
+otherwise a slower pure Python path produces the same format.
+
+Output only depends on the seed, not on how many worker processes
+are used or whether NumPy is installed: missions are generated in
+fixed-size batches, each with its own child seed derived from the
+root seed. Both paths shuffle by sorting the same random keys, drawn
+from random.Random, so they deal the same cards.
+
+Usage: python -m game.generate N [--tasks 1,1,2] [--format jsonl|binary]
+"""
+
+import argparse
+import array
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import json
+import random
+import sys
+import time
+from typing import BinaryIO, Iterator, TextIO
+
+from game.card import CARDS
+from game.mission import Mission
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+BATCH_SIZE = 100_000
+
+
+def generate(n_missions: int, task_sizes: list[int], seed: int | None = None):
+    """
+    Generate n_missions missions with tasks of the given sizes.
+
+    Returns a (n_missions, sum(task_sizes)) array of card codes: a
+    numpy.ndarray of uint8 if NumPy is available, otherwise a list of
+    rows.
+    """
+    if any(size < 1 for size in task_sizes):
+        raise ValueError(f"tasks need at least 1 card each, not {task_sizes}")
+    n_cards = sum(task_sizes)
+    if not 0 < n_cards <= len(CARDS):
+        raise ValueError(f"missions need 1 to {len(CARDS)} cards, not {n_cards}")
+    # A 32-bit little-endian key per card per mission. Sorting a row's keys
+    # (ties in card order) gives its permutation; coloured card codes are
+    # 0-35, so deck positions are already codes.
+    keys = random.Random(seed).randbytes(n_missions * len(CARDS) * 4)
+    if numpy is None:
+        return _generate_python(n_missions, task_sizes, keys)
+    return _generate_numpy(n_missions, task_sizes, keys)
+
+
+def _generate_numpy(n_missions: int, task_sizes: list[int], keys: bytes):
+    n_cards = sum(task_sizes)
+    keys = numpy.frombuffer(keys, dtype="<u4").reshape(n_missions, len(CARDS))
+    codes = numpy.argsort(keys, axis=1, kind="stable")[:, :n_cards]
+    codes = codes.astype(numpy.uint8)
+    start = 0
+    for size in task_sizes:
+        codes[:, start : start + size].sort(axis=1)
+        start += size
+    return codes
+
+
+def _generate_python(n_missions: int, task_sizes: list[int], keys: bytes):
+    n_cards = sum(task_sizes)
+    n_codes = len(CARDS)
+    codes = range(n_codes)
+    keys = array.array("I", keys)
+    if sys.byteorder == "big":
+        keys.byteswap()
+    keys = keys.tolist()
+    rows = []
+    for i in range(0, n_missions * n_codes, n_codes):
+        row = sorted(codes, key=keys[i : i + n_codes].__getitem__)[:n_cards]
+        start = 0
+        for size in task_sizes:
+            row[start : start + size] = sorted(row[start : start + size])
+            start += size
+        rows.append(row)
+    return rows
+
+
+def child_seed(seed: int, index: int):
+    """Seed for batch number index, independent of the other batches."""
+    data = f"{seed}/{index}".encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _batch_args(n_missions: int, task_sizes: list[int], seed: int):
+    for index, start in enumerate(range(0, n_missions, BATCH_SIZE)):
+        size = min(BATCH_SIZE, n_missions - start)
+        yield size, task_sizes, child_seed(seed, index)
+
+
+def batches(
+    n_missions: int,
+    task_sizes: list[int],
+    seed: int,
+    workers: int = 1,
+) -> Iterator:
+    """
+    Same as generate(), but yields the rows in batches of BATCH_SIZE.
+
+    With workers > 1, batches are generated in a process pool but still
+    yielded in order, so the result is the same for any worker count.
+    """
+    args = list(_batch_args(n_missions, task_sizes, seed))
+    if workers <= 1:
+        for batch_args in args:
+            yield generate(*batch_args)
+        return
+    with ProcessPoolExecutor(workers) as executor:
+        yield from executor.map(generate, *zip(*args))
+
+
+def write_jsonl(file: TextIO, rows, task_sizes: list[int]):
+    """Write one mission per line, as a list of tasks of card codes."""
+    for row in rows:
+        row = [int(code) for code in row]
+        tasks = []
+        start = 0
+        for size in task_sizes:
+            tasks.append(row[start : start + size])
+            start += size
+        file.write(json.dumps(tasks, separators=(",", ":")))
+        file.write("\n")
+
+
+def write_binary(file: BinaryIO, rows):
+    """Write card codes as raw bytes, one fixed-size record per mission."""
+    if numpy is not None and isinstance(rows, numpy.ndarray):
+        file.write(rows.astype(numpy.uint8).tobytes())
+        return
+    for row in rows:
+        file.write(array.array("B", row).tobytes())
+
+
+def benchmark(n_missions: int, task_sizes: list[int]):
+    """Missions per second for generate() and for the Mission/Deck path."""
+    start = time.perf_counter()
+    generate(n_missions, task_sizes)
+    batch_rate = n_missions / (time.perf_counter() - start)
+
+    mission = Mission()
+    start = time.perf_counter()
+    for _ in range(n_missions):
+        mission.reset()
+        for size in task_sizes:
+            mission.add_task(size)
+    deck_rate = n_missions / (time.perf_counter() - start)
+
+    return batch_rate, deck_rate
+
+
+def _task_sizes(text: str):
+    """Parse --tasks, e.g. "1,1,2"."""
+    try:
+        sizes = [int(size) for size in text.split(",")]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not a list of numbers: {text!r}") from None
+    if any(size < 1 for size in sizes):
+        raise argparse.ArgumentTypeError(f"tasks need at least 1 card each: {text!r}")
+    return sizes
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.generate",
+        description="Generate missions in bulk.",
+    )
+    parser.add_argument("n_missions", type=int)
+    parser.add_argument(
+        "--tasks",
+        type=_task_sizes,
+        default="1,1,2",
+        help="comma separated number of cards in each task (default: 1,1,2)",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="number of processes to generate with (default: 1)",
+    )
+    parser.add_argument("--format", choices=["jsonl", "binary"], default="jsonl")
+    parser.add_argument("--output", "-o", help="output file (default: stdout)")
+    parser.add_argument(
+        "--benchmark",
+        action="store_true",
+        help="compare throughput against Mission.add_task instead",
+    )
+    args = parser.parse_args(argv)
+    task_sizes = args.tasks
+
+    if args.benchmark:
+        batch_rate, deck_rate = benchmark(args.n_missions, task_sizes)
+        backend = "numpy" if numpy is not None else "python"
+        print(f"generate ({backend}): {batch_rate:,.0f} missions/s")
+        print(f"Mission.add_task: {deck_rate:,.0f} missions/s")
+        print(f"speedup: {batch_rate / deck_rate:.1f}x")
+        return
+
+    seed = args.seed
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(64)
+        print(f"seed: {seed}", file=sys.stderr)
+
+    if args.format == "jsonl":
+        file = sys.stdout if args.output is None else open(args.output, "w")
+    else:
+        file = sys.stdout.buffer if args.output is None else open(args.output, "wb")
+    try:
+        for rows in batches(args.n_missions, task_sizes, seed, args.workers):
+            if args.format == "jsonl":
+                write_jsonl(file, rows, task_sizes)
+            else:
+                write_binary(file, rows)
+    finally:
+        if args.output is not None:
+            file.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Undo history for the tasks on the mission screen.
+
+Each step is an immutable Board. Boards share structure: changing a
+slot copies only that slot's row and the tuple of rows, and every other
+row is shared with the previous board. A step therefore costs memory
+in proportion to what changed, and undo/redo just move a board between
+two stacks.
+"""
+
+from collections import deque
+from typing import NamedTuple
+
+from game.player import Player
+from game.task import Task
+
+
+HISTORY_LIMIT = 500
+"""Number of steps that can be undone."""
+
+
+class SlotState(NamedTuple):
+    """A task as it was at one step, since Task itself is mutable."""
+
+    task: Task
+    done: int
+    assignee: Player
+
+    @classmethod
+    def of(cls, task: Task | None):
+        if task is None:
+            return None
+        return cls(task, task.done, task.assignee)
+
+    def restore(self):
+        """Put the task back how it was, returning it."""
+        self.task.done = self.done
+        self.task.assignee = self.assignee
+        return self.task
+
+
+class Board:
+    """Immutable slots, stored as a tuple of rows of SlotState (or None)."""
+
+    __slots__ = ("rows", "columns")
+
+    def __init__(
+        self, rows: tuple[tuple[SlotState | None, ...], ...], columns: int
+    ):
+        self.rows = rows
+        self.columns = columns
+
+    @classmethod
+    def capture(cls, tasks: list[Task | None], columns: int = 3):
+        states = [SlotState.of(task) for task in tasks]
+        rows = tuple(
+            tuple(states[i : i + columns]) for i in range(0, len(states), columns)
+        )
+        return cls(rows, columns)
+
+    def __len__(self):
+        return sum(len(row) for row in self.rows)
+
+    def __getitem__(self, slot: int):
+        row, column = divmod(slot, self.columns)
+        return self.rows[row][column]
+
+    def set(self, slot: int, state: SlotState | None):
+        """New board with slot changed, sharing every other row."""
+        row, column = divmod(slot, self.columns)
+        old_row = self.rows[row]
+        new_row = old_row[:column] + (state,) + old_row[column + 1 :]
+        rows = self.rows[:row] + (new_row,) + self.rows[row + 1 :]
+        return Board(rows, self.columns)
+
+    def swap(self, slot1: int, slot2: int):
+        state1 = self[slot1]
+        return self.set(slot1, self[slot2]).set(slot2, state1)
+
+    def changed(self, other: "Board"):
+        """Slots that differ from other, skipping shared rows."""
+        slots = []
+        for i, (row, other_row) in enumerate(zip(self.rows, other.rows)):
+            if row is other_row:
+                continue
+            for j, (state, other_state) in enumerate(zip(row, other_row)):
+                if state != other_state:
+                    slots.append(i * self.columns + j)
+        return slots
+
+
+class History:
+
+    def __init__(self, board: Board, limit: int = HISTORY_LIMIT):
+        self.board = board
+        self._undo: deque[Board] = deque(maxlen=limit)
+        self._redo: list[Board] = []
+
+    @property
+    def can_undo(self):
+        return bool(self._undo)
+
+    @property
+    def can_redo(self):
+        return bool(self._redo)
+
+    def reset(self, board: Board):
+        """Start over from board, forgetting every step."""
+        self.board = board
+        self._undo.clear()
+        self._redo.clear()
+
+    def push(self, board: Board):
+        """Move on to board, dropping anything that could be redone."""
+        self._undo.append(self.board)
+        self._redo.clear()
+        self.board = board
+
+    def undo(self):
+        """The previous board, or None if there's nothing to undo."""
+        if not self._undo:
+            return None
+        self._redo.append(self.board)
+        self.board = self._undo.pop()
+        return self.board
+
+    def redo(self):
+        if not self._redo:
+            return None
+        self._undo.append(self.board)
+        self.board = self._redo.pop()
+        return self.board
@@ -0,0 +1,242 @@
+"""
+Crash-safe record of the current mission.
+
+Every change to the mission is appended to a log file as one JSON line.
+Every so often the whole state is written to a snapshot file and the
+log starts over, so resuming only has to replay a short tail. Writing
+happens on a background thread, which batches records and fsyncs each
+batch, so recording a change never waits on the disk.
+
+Records and snapshots carry sequence numbers. A crash between writing
+a snapshot and truncating the log leaves records that the snapshot
+already covers, and these are skipped on load.
+
+Tasks are referred to by slot: their position on the mission screen.
+"""
+
+import json
+import os
+import queue
+import threading
+import time
+
+from game.card import Card
+from game.mission import Mission
+from game.player import Player
+from game.players import BLANK_PLAYER
+from game.task import Task
+
+
+SESSION_FOLDER = "session"
+
+SNAPSHOT_INTERVAL = 200
+"""Records to append before compacting the log into a new snapshot."""
+
+
+class Journal:
+
+    def __init__(self, folder: str = SESSION_FOLDER, batch_delay: float = 0.05):
+        self.folder = folder
+        self.log_path = os.path.join(folder, "mission.log")
+        self.snapshot_path = os.path.join(folder, "mission.json")
+        self.batch_delay = batch_delay
+        """Seconds to wait for more records before writing a batch."""
+        self.seq = 0
+        self.since_snapshot = 0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    def load(self) -> tuple[dict | None, list[dict]]:
+        """The latest snapshot (if any) and the records logged after it."""
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+        start = 0 if snapshot is None else snapshot["seq"]
+        records = []
+        if os.path.exists(self.log_path):
+            with open(self.log_path, encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        # Torn write from a crash, nothing after it was synced
+                        break
+                    if record["seq"] > start:
+                        records.append(record)
+        self.seq = records[-1]["seq"] if records else start
+        self.since_snapshot = len(records)
+        return snapshot, records
+
+    def restore(self, mission: Mission) -> dict[int, Task] | None:
+        """
+        Load the saved session into mission, returning its tasks by slot.
+
+        Returns None if no mission had been started, though players are
+        still restored.
+        """
+        snapshot, records = self.load()
+        slots: dict[int, Task] = {}
+        started = snapshot is not None
+        if snapshot is not None:
+            _apply_snapshot(mission, slots, snapshot)
+        for record in records:
+            _apply(mission, slots, record)
+            started = started or record["op"] == "reset"
+        return slots if started else None
+
+    def append(self, op: str, **fields):
+        """Queue a record of one change for writing."""
+        self.seq += 1
+        self.since_snapshot += 1
+        self._put(("record", {"seq": self.seq, "op": op, **fields}))
+
+    def snapshot(self, state: dict):
+        """Queue state (see mission_state()) to replace the log so far."""
+        self.since_snapshot = 0
+        self._put(("snapshot", {"seq": self.seq, **state}))
+
+    def flush(self):
+        """Wait until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def _put(self, item: tuple[str, dict]):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._queue.put(item)
+
+    def _run(self):
+        os.makedirs(self.folder, exist_ok=True)
+        log = open(self.log_path, "a", encoding="utf-8")
+        try:
+            while True:
+                batch = self._next_batch()
+                for item in batch:
+                    if item is None:
+                        continue
+                    kind, data = item
+                    if kind == "record":
+                        log.write(json.dumps(data, separators=(",", ":")))
+                        log.write("\n")
+                    else:
+                        self._write_snapshot(data)
+                        log.close()
+                        log = open(self.log_path, "w", encoding="utf-8")
+                log.flush()
+                os.fsync(log.fileno())
+                for _ in batch:
+                    self._queue.task_done()
+                if batch[-1] is None:
+                    return
+        finally:
+            log.close()
+
+    def _next_batch(self):
+        """Block for one item, then take whatever else arrives shortly after."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.batch_delay
+        while batch[-1] is not None:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_snapshot(self, data: dict):
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump(data, file, separators=(",", ":"))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+
+def mission_state(mission: Mission, slots: dict[int, Task]):
+    """Everything needed to rebuild mission and its slots, as plain data."""
+    return {
+        "seed": mission.seed,
+        "play_id": mission.play_id,
+        "deck": [card.code for card in mission.deck.cards],
+        "players": [player.id for player in mission.players],
+        "tasks": [
+            {
+                "cards": [card.code for card in task.cards],
+                "assignee": task.assignee.id,
+                "done": task.done,
+            }
+            for task in mission.tasks
+        ],
+        "slots": {
+            str(slot): mission.tasks.index(task) for slot, task in slots.items()
+        },
+    }
+
+
+def _player(id: str):
+    if id == BLANK_PLAYER.id or not os.path.exists(id):
+        # Icon has been removed from the players folder since
+        return BLANK_PLAYER
+    return Player(id)
+
+
+def _set_players(mission: Mission, ids: list[str]):
+    for player in list(mission.players):
+        mission.players.remove(player)
+    mission.players.add(BLANK_PLAYER)
+    for id in ids:
+        mission.players.add(_player(id))
+
+
+def _apply_snapshot(mission: Mission, slots: dict[int, Task], snapshot: dict):
+    mission.reset(snapshot["seed"], snapshot.get("play_id"))
+    mission.deck.cards[:] = [Card.from_code(code) for code in snapshot["deck"]]
+    _set_players(mission, snapshot["players"])
+    for data in snapshot["tasks"]:
+        task = Task([Card.from_code(code) for code in data["cards"]])
+        task.assignee = _player(data["assignee"])
+        task.done = data["done"]
+        mission.tasks.append(task)
+    slots.clear()
+    for slot, index in snapshot["slots"].items():
+        slots[int(slot)] = mission.tasks[index]
+
+
+def _apply(mission: Mission, slots: dict[int, Task], record: dict):
+    op = record["op"]
+    if op == "reset":
+        mission.reset(record["seed"], record.get("play_id"))
+        slots.clear()
+    elif op == "add":
+        mission.add_task(record["cards"])
+        slots[record["slot"]] = mission.tasks[-1]
+    elif op == "special":
+        mission.add_special_task()
+        slots[record["slot"]] = mission.tasks[-1]
+    elif op == "toggle":
+        slots[record["slot"]].toggle_done(record["card"])
+    elif op == "assign":
+        slots[record["slot"]].assignee = _player(record["player"])
+    elif op == "swap":
+        slot1, slot2 = record["slots"]
+        task1 = slots.pop(slot1, None)
+        task2 = slots.pop(slot2, None)
+        if task2 is not None:
+            slots[slot1] = task2
+        if task1 is not None:
+            slots[slot2] = task1
+    elif op == "players":
+        _set_players(mission, record["players"])
+    else:
+        raise ValueError(f"unknown journal record {op!r}")
@@ -1,20 +1,41 @@
+import os
+import random
+
 from game.card import Card
 from game.deck import Deck
-from game.player import Player
 from game.players import BLANK_PLAYER
+from game.roster import Roster
 from game.task import Task
 
 
 class Mission:
+    """
+    Tasks dealt for one game.
+
+    Every deal has its own seed (self.seed), so a reported mission can
+    be replayed with reset(seed). Seeds for successive deals are drawn
+    from a generator seeded with the seed passed in here; a Mission
+    created without one uses fresh OS randomness.
+
+    Each deal also gets a random play_id, which tells apart two plays
+    of the same seed.
+    """
 
-    def __init__(self):
-        self.players: list[Player] = [BLANK_PLAYER]
+    def __init__(self, seed: int | None = None):
+        self.players = Roster([BLANK_PLAYER])
+        self._seeds = random.Random(seed)
+        self.seed = 0
+        self.play_id = ""
         self.deck = Deck()
         self.tasks: list[Task] = []
         self.reset()
 
-    def reset(self):
-        self.deck.reset()
+    def reset(self, seed: int | None = None, play_id: str | None = None):
+        if seed is None:
+            seed = self._seeds.getrandbits(64)
+        self.seed = seed
+        self.play_id = play_id or os.urandom(8).hex()
+        self.deck.reset(seed)
         self.tasks.clear()
 
     def add_task(self, n_cards: int):
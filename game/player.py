@@ -1,5 +1,25 @@
 class Player:
+    """
+    A player, identified by their icon's path.
+
+    Players with the same icon are equal, so a player keeps the same
+    identity across rescans of the players folder.
+    """
 
     def __init__(self, name: str):
         self.name = name
-        self.index = 0
+
+    @property
+    def id(self):
+        return self.name
+
+    def __eq__(self, other):
+        if not isinstance(other, Player):
+            return NotImplemented
+        return self.id == other.id
+
+    def __hash__(self):
+        return hash(self.id)
+
+    def __repr__(self):
+        return f"Player({self.name!r})"
@@ -1,13 +1,186 @@
+import ctypes
 import os
+import struct
+import sys
+from typing import NamedTuple
 
 from game.player import Player
 
 
-PLAYERS = [
-    Player(f"players/{filename}")
-    for filename in os.listdir("players")
-    if filename.endswith(".png")
-]
-PLAYERS.sort(key=lambda player: player.name)
+PLAYERS_FOLDER = "players"
+
+
+def scan_players(folder: str = PLAYERS_FOLDER):
+    """All player icons in folder, sorted by filename."""
+    players = [
+        Player(f"{folder}/{filename}")
+        for filename in os.listdir(folder)
+        if filename.endswith(".png")
+    ]
+    players.sort(key=lambda player: player.name)
+    return players
+
 
 BLANK_PLAYER = Player("assets/blank.png")
+
+
+class PlayerChanges(NamedTuple):
+    """Icons added to, removed from and changed in the players folder."""
+
+    added: list[Player]
+    removed: list[Player]
+    changed: list[Player]
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+
+# From <sys/inotify.h>
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_DELETE = 0x200
+_IN_DELETE_SELF = 0x400
+_IN_Q_OVERFLOW = 0x4000
+_IN_IGNORED = 0x8000
+_EVENT = struct.Struct("iIII")
+
+
+def _inotify_watch(folder: str):
+    """A non-blocking inotify descriptor watching folder, or None."""
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+    except (OSError, AttributeError):
+        return None
+    if fd < 0:
+        return None
+    mask = (
+        _IN_CLOSE_WRITE | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_DELETE | _IN_DELETE_SELF
+    )
+    if libc.inotify_add_watch(fd, os.fsencode(folder), mask) < 0:
+        os.close(fd)
+        return None
+    return fd
+
+
+class PlayersWatcher:
+    """
+    Notices icons being added to, removed from or changed in a folder.
+
+    poll() never blocks, and returns what changed since the last call.
+    With inotify (Linux) it's one read of the pending events, and only
+    the files they name are looked at. Otherwise the folder is scanned
+    and mtimes compared; a new or changed file is only reported once
+    it's looked the same for two polls, so it isn't read half-written.
+    """
+
+    def __init__(self, folder: str = PLAYERS_FOLDER):
+        self.folder = folder
+        # Watch before scanning, so nothing in between is missed
+        self._fd = _inotify_watch(folder)
+        self._stamps = self._scan()
+        self._pending: dict[str, tuple[int, int] | None] = {}
+
+    @property
+    def using_inotify(self):
+        return self._fd is not None
+
+    def poll(self):
+        if self._fd is None:
+            stamps = self._poll_scan()
+        else:
+            stamps = self._poll_inotify()
+        changes = PlayerChanges(
+            added=self._players(stamps.keys() - self._stamps.keys()),
+            removed=self._players(self._stamps.keys() - stamps.keys()),
+            changed=self._players(
+                name
+                for name in stamps.keys() & self._stamps.keys()
+                if stamps[name] != self._stamps[name]
+            ),
+        )
+        self._stamps = stamps
+        return changes
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def _players(self, names):
+        return [Player(f"{self.folder}/{name}") for name in sorted(names)]
+
+    def _stamp(self, name: str):
+        try:
+            stat = os.stat(os.path.join(self.folder, name))
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _scan(self):
+        try:
+            names = os.listdir(self.folder)
+        except OSError:
+            return {}
+        stamps = {}
+        for name in names:
+            if name.endswith(".png"):
+                stamp = self._stamp(name)
+                if stamp is not None:
+                    stamps[name] = stamp
+        return stamps
+
+    def _poll_scan(self):
+        scanned = self._scan()
+        stamps = dict(self._stamps)
+        pending = {}
+        for name in scanned.keys() | self._stamps.keys():
+            stamp = scanned.get(name)
+            if stamp == self._stamps.get(name):
+                continue
+            if stamp is None:
+                del stamps[name]
+            elif self._pending.get(name) == stamp:
+                stamps[name] = stamp
+            else:
+                pending[name] = stamp
+        self._pending = pending
+        return stamps
+
+    def _poll_inotify(self):
+        names = set()
+        rescan = False
+        while self._fd is not None:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+            pos = 0
+            while pos < len(data):
+                _, mask, _, length = _EVENT.unpack_from(data, pos)
+                name = data[pos + _EVENT.size : pos + _EVENT.size + length]
+                pos += _EVENT.size + length
+                if mask & _IN_Q_OVERFLOW:
+                    rescan = True
+                elif mask & (_IN_DELETE_SELF | _IN_IGNORED):
+                    # The folder itself has gone, so fall back to polling
+                    self.close()
+                    rescan = True
+                    break
+                else:
+                    names.add(os.fsdecode(name.rstrip(b"\0")))
+        if rescan:
+            return self._scan()
+        stamps = dict(self._stamps)
+        for name in names:
+            if not name.endswith(".png"):
+                continue
+            stamp = self._stamp(name)
+            if stamp is None:
+                stamps.pop(name, None)
+            else:
+                stamps[name] = stamp
+        return stamps
@@ -15,10 +15,10 @@ class Rank(Enum):
     EIGHT = 8
     NINE = 9
 
-    def __eq__(self, other):
-        if not isinstance(other, Rank):
-            return NotImplemented
-        return self.value == other.value
+    @property
+    def code(self):
+        """Dense integer code, 0 to 8."""
+        return self.value - 1
 
     def __lt__(self, other):
         if not isinstance(other, Rank):
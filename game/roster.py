@@ -0,0 +1,66 @@
+from typing import Iterable, Iterator
+
+from game.player import Player
+
+
+class Roster:
+    """
+    Ordered set of players.
+
+    Membership, position and next-player lookups are O(1). Removing a
+    player is O(n), as everyone after them moves up a place.
+    """
+
+    def __init__(self, players: Iterable[Player] = ()):
+        self._players: list[Player] = []
+        self._positions: dict[Player, int] = {}
+        for player in players:
+            self.add(player)
+
+    def __len__(self):
+        return len(self._players)
+
+    def __iter__(self) -> Iterator[Player]:
+        return iter(self._players)
+
+    def __getitem__(self, position: int):
+        return self._players[position]
+
+    def __contains__(self, player: object):
+        return player in self._positions
+
+    def __repr__(self):
+        return f"Roster({self._players!r})"
+
+    def index(self, player: Player):
+        """Position of player, raising ValueError if they're not present."""
+        try:
+            return self._positions[player]
+        except KeyError:
+            raise ValueError(f"{player!r} is not in roster") from None
+
+    def add(self, player: Player):
+        """Add player to the end, unless they're already present."""
+        if player in self._positions:
+            return
+        self._positions[player] = len(self._players)
+        self._players.append(player)
+
+    def remove(self, player: Player):
+        position = self.index(player)
+        del self._players[position]
+        del self._positions[player]
+        for i in range(position, len(self._players)):
+            self._positions[self._players[i]] = i
+
+    def next(self, player: Player):
+        """
+        The player after player, wrapping around to the first.
+
+        Players not in the roster (e.g. removed since) are followed by
+        the first player.
+        """
+        position = self._positions.get(player)
+        if position is None or position + 1 == len(self._players):
+            return self._players[0]
+        return self._players[position + 1]
@@ -0,0 +1,449 @@
+"""
+SQLite record of past missions, for statistics across game nights.
+
+Each mission is stored once it's over (when it's reset, or when the
+application closes) with its players and tasks: who was assigned each
+task, which cards it had, and which of them got done. A mission counts
+as a success if every card of every task was done.
+
+Missions are keyed by Mission.play_id, so replaying a seed adds a new
+mission, while saving the same play again (say, after it's resumed and
+finished) replaces the earlier save.
+
+Per-player and per-task-count totals are kept up to date by triggers,
+so reports read a handful of rows however many missions are stored.
+
+Writes go through a queue to a background thread, which commits
+whatever has piled up in a single transaction. The database runs in
+WAL mode, so reports can be read while missions are being written.
+
+Usage: python -m game.store [--db PATH] report|missions|benchmark
+"""
+
+import argparse
+import os
+import queue
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+from game.journal import SESSION_FOLDER
+from game.mission import Mission
+from game.players import BLANK_PLAYER
+
+
+STORE_PATH = os.path.join(SESSION_FOLDER, "history.db")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS missions (
+    id INTEGER PRIMARY KEY,
+    play_id TEXT NOT NULL UNIQUE,
+    seed TEXT NOT NULL,
+    played_at REAL NOT NULL,
+    n_players INTEGER NOT NULL,
+    n_tasks INTEGER NOT NULL,
+    success INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS mission_players (
+    mission_id INTEGER NOT NULL REFERENCES missions (id) ON DELETE CASCADE,
+    player TEXT NOT NULL,
+    PRIMARY KEY (mission_id, player)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    mission_id INTEGER NOT NULL REFERENCES missions (id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    player TEXT,
+    n_cards INTEGER NOT NULL,
+    completed INTEGER NOT NULL,
+    PRIMARY KEY (mission_id, position)
+);
+CREATE TABLE IF NOT EXISTS task_cards (
+    mission_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    card INTEGER NOT NULL,
+    done INTEGER NOT NULL,
+    FOREIGN KEY (mission_id, position)
+        REFERENCES tasks (mission_id, position) ON DELETE CASCADE
+);
+CREATE INDEX IF NOT EXISTS missions_by_seed
+    ON missions (seed);
+CREATE INDEX IF NOT EXISTS missions_by_tasks
+    ON missions (n_tasks, success);
+CREATE INDEX IF NOT EXISTS missions_by_time
+    ON missions (played_at);
+CREATE INDEX IF NOT EXISTS players_by_player
+    ON mission_players (player, mission_id);
+CREATE INDEX IF NOT EXISTS tasks_by_player
+    ON tasks (player, completed);
+CREATE INDEX IF NOT EXISTS cards_by_task
+    ON task_cards (mission_id, position);
+CREATE INDEX IF NOT EXISTS cards_by_card
+    ON task_cards (card, done);
+
+CREATE TABLE IF NOT EXISTS player_stats (
+    player TEXT PRIMARY KEY,
+    missions INTEGER NOT NULL DEFAULT 0,
+    won INTEGER NOT NULL DEFAULT 0,
+    tasks INTEGER NOT NULL DEFAULT 0,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS task_count_stats (
+    n_tasks INTEGER PRIMARY KEY,
+    missions INTEGER NOT NULL DEFAULT 0,
+    won INTEGER NOT NULL DEFAULT 0
+);
+CREATE TRIGGER IF NOT EXISTS count_mission AFTER INSERT ON missions BEGIN
+    INSERT OR IGNORE INTO task_count_stats (n_tasks) VALUES (NEW.n_tasks);
+    UPDATE task_count_stats
+        SET missions = missions + 1, won = won + NEW.success
+        WHERE n_tasks = NEW.n_tasks;
+END;
+CREATE TRIGGER IF NOT EXISTS uncount_mission AFTER DELETE ON missions BEGIN
+    UPDATE task_count_stats
+        SET missions = missions - 1, won = won - OLD.success
+        WHERE n_tasks = OLD.n_tasks;
+END;
+CREATE TRIGGER IF NOT EXISTS count_player AFTER INSERT ON mission_players BEGIN
+    INSERT OR IGNORE INTO player_stats (player) VALUES (NEW.player);
+    UPDATE player_stats
+        SET missions = missions + 1,
+            won = won + (SELECT success FROM missions WHERE id = NEW.mission_id)
+        WHERE player = NEW.player;
+END;
+CREATE TRIGGER IF NOT EXISTS uncount_player AFTER DELETE ON mission_players BEGIN
+    UPDATE player_stats
+        SET missions = missions - 1,
+            won = won - (SELECT success FROM missions WHERE id = OLD.mission_id)
+        WHERE player = OLD.player;
+END;
+CREATE TRIGGER IF NOT EXISTS count_task AFTER INSERT ON tasks
+WHEN NEW.player IS NOT NULL BEGIN
+    INSERT OR IGNORE INTO player_stats (player) VALUES (NEW.player);
+    UPDATE player_stats
+        SET tasks = tasks + 1, completed = completed + NEW.completed
+        WHERE player = NEW.player;
+END;
+CREATE TRIGGER IF NOT EXISTS uncount_task AFTER DELETE ON tasks
+WHEN OLD.player IS NOT NULL BEGIN
+    UPDATE player_stats
+        SET tasks = tasks - 1, completed = completed - OLD.completed
+        WHERE player = OLD.player;
+END;
+"""
+
+
+def _connect(path: str):
+    connection = sqlite3.connect(path)
+    connection.execute("PRAGMA journal_mode = WAL")
+    connection.execute("PRAGMA synchronous = NORMAL")
+    connection.execute("PRAGMA foreign_keys = ON")
+    return connection
+
+
+def mission_record(mission: Mission, played_at: float | None = None):
+    """
+    Plain data for one mission, as passed to Store.add().
+
+    Taken on the calling thread so the mission can keep changing.
+    """
+    if played_at is None:
+        played_at = time.time()
+    tasks = []
+    for task in mission.tasks:
+        player = None if task.assignee is BLANK_PLAYER else task.assignee.id
+        cards = [(card.code, task.is_done(i)) for i, card in enumerate(task.cards)]
+        tasks.append((player, cards))
+    return {
+        "play_id": mission.play_id,
+        "seed": str(mission.seed),
+        "played_at": played_at,
+        "players": [
+            player.id for player in mission.players if player is not BLANK_PLAYER
+        ],
+        "tasks": tasks,
+    }
+
+
+class Store:
+
+    def __init__(self, path: str = STORE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = _connect(path)
+        try:
+            connection.executescript(_SCHEMA)
+        finally:
+            connection.close()
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._reader: sqlite3.Connection | None = None
+
+    def record(self, mission: Mission):
+        """Queue mission to be saved, replacing any earlier save of this play."""
+        if mission.tasks:
+            self.add(mission_record(mission))
+
+    def add(self, record: dict):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        self._queue.put(record)
+
+    def flush(self):
+        """Wait until everything queued so far has been committed."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def _run(self):
+        connection = _connect(self.path)
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while batch[-1] is not None:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                try:
+                    _insert_batch(connection, [r for r in batch if r is not None])
+                finally:
+                    # Even if it failed, so flush() and close() don't wait forever
+                    for _ in batch:
+                        self._queue.task_done()
+                if batch[-1] is None:
+                    return
+        finally:
+            connection.close()
+
+    def _query(self, sql: str, parameters: tuple = ()):
+        # Reads happen on the caller's thread, so they get their own connection
+        if self._reader is None:
+            self._reader = _connect(self.path)
+        return self._reader.execute(sql, parameters).fetchall()
+
+    def mission_count(self):
+        return self._query("SELECT COUNT(*) FROM missions")[0][0]
+
+    def missions(self, limit: int = 20):
+        """
+        Most recent missions, as
+        (play_id, seed, played_at, players, tasks, success).
+        """
+        return self._query(
+            "SELECT play_id, seed, played_at, n_players, n_tasks, success"
+            " FROM missions ORDER BY played_at DESC LIMIT ?",
+            (limit,),
+        )
+
+    def tasks(self, play_id: str):
+        """Tasks of one mission as (player, card, done) rows, in order."""
+        return self._query(
+            "SELECT tasks.player, task_cards.card, task_cards.done"
+            " FROM missions"
+            " JOIN tasks ON tasks.mission_id = missions.id"
+            " JOIN task_cards USING (mission_id, position)"
+            " WHERE missions.play_id = ?"
+            " ORDER BY tasks.position, task_cards.card",
+            (play_id,),
+        )
+
+    def success_by_player(self):
+        """(player, missions played, missions won) for every player."""
+        return self._query(
+            "SELECT player, missions, won FROM player_stats"
+            " WHERE missions > 0 ORDER BY player"
+        )
+
+    def tasks_by_player(self):
+        """(player, tasks assigned, tasks completed) for every player."""
+        return self._query(
+            "SELECT player, tasks, completed FROM player_stats"
+            " WHERE tasks > 0 ORDER BY player"
+        )
+
+    def success_by_task_count(self):
+        """(number of tasks, missions, missions won) for every task count."""
+        return self._query(
+            "SELECT n_tasks, missions, won FROM task_count_stats"
+            " WHERE missions > 0 ORDER BY n_tasks"
+        )
+
+
+def _insert_batch(connection: sqlite3.Connection, records: list[dict]):
+    """
+    Commit records in one transaction.
+
+    If that fails, they're retried one at a time, so one bad record (or
+    a full disk) only loses what can't be written. Failures are printed
+    rather than raised, which would stop the writer thread.
+    """
+    try:
+        with connection:
+            for record in records:
+                _insert(connection, record)
+        return
+    except sqlite3.Error as error:
+        if len(records) == 1:
+            print(f"store: can't save mission: {error}", file=sys.stderr)
+            return
+    for record in records:
+        _insert_batch(connection, [record])
+
+
+def _insert(connection: sqlite3.Connection, record: dict):
+    tasks = record["tasks"]
+    success = all(done for _, cards in tasks for _, done in cards)
+    old = connection.execute(
+        "SELECT id FROM missions WHERE play_id = ?", (record["play_id"],)
+    ).fetchone()
+    if old is not None:
+        # Children first, so their triggers can still see the mission's result
+        connection.execute("DELETE FROM task_cards WHERE mission_id = ?", old)
+        connection.execute("DELETE FROM tasks WHERE mission_id = ?", old)
+        connection.execute("DELETE FROM mission_players WHERE mission_id = ?", old)
+        connection.execute("DELETE FROM missions WHERE id = ?", old)
+    mission_id = connection.execute(
+        "INSERT INTO missions"
+        " (play_id, seed, played_at, n_players, n_tasks, success)"
+        " VALUES (?, ?, ?, ?, ?, ?)",
+        (
+            record["play_id"],
+            record["seed"],
+            record["played_at"],
+            len(record["players"]),
+            len(tasks),
+            success,
+        ),
+    ).lastrowid
+    connection.executemany(
+        "INSERT INTO mission_players (mission_id, player) VALUES (?, ?)",
+        [(mission_id, player) for player in record["players"]],
+    )
+    connection.executemany(
+        "INSERT INTO tasks (mission_id, position, player, n_cards, completed)"
+        " VALUES (?, ?, ?, ?, ?)",
+        [
+            (mission_id, position, player, len(cards), all(d for _, d in cards))
+            for position, (player, cards) in enumerate(tasks)
+        ],
+    )
+    connection.executemany(
+        "INSERT INTO task_cards (mission_id, position, card, done)"
+        " VALUES (?, ?, ?, ?)",
+        [
+            (mission_id, position, code, done)
+            for position, (_, cards) in enumerate(tasks)
+            for code, done in cards
+        ],
+    )
+
+
+def _random_record(rng: random.Random, players: list[str]):
+    """A made-up mission for benchmarking."""
+    crew = rng.sample(players, rng.randint(3, 5))
+    codes = rng.sample(range(36), rng.randint(1, 10))
+    tasks = []
+    for code in codes:
+        player = rng.choice(crew + [None])
+        tasks.append((player, [(code, rng.random() < 0.8)]))
+    return {
+        "play_id": f"{rng.getrandbits(64):016x}",
+        "seed": str(rng.getrandbits(64)),
+        "played_at": rng.uniform(0, time.time()),
+        "players": crew,
+        "tasks": tasks,
+    }
+
+
+def _percent(won: int, total: int):
+    return f"{won / total:.0%}" if total else "-"
+
+
+def _report(store: Store):
+    start = time.perf_counter()
+    by_player = store.success_by_player()
+    tasks_by_player = {
+        player: (assigned, done) for player, assigned, done in store.tasks_by_player()
+    }
+    by_count = store.success_by_task_count()
+    elapsed = time.perf_counter() - start
+
+    print("player: missions won, tasks completed")
+    for player, played, won in by_player:
+        assigned, done = tasks_by_player.get(player, (0, 0))
+        print(
+            f"  {player}: {won}/{played} ({_percent(won, played)}),"
+            f" {done}/{assigned} ({_percent(done, assigned)})"
+        )
+    print("tasks: missions won")
+    for n_tasks, played, won in by_count:
+        print(f"  {n_tasks}: {won}/{played} ({_percent(won, played)})")
+    return elapsed
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.store",
+        description="Query the history of recorded missions.",
+    )
+    parser.add_argument("--db", default=STORE_PATH, help=f"default: {STORE_PATH}")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("report", help="success rates by player and task count")
+    missions_parser = commands.add_parser("missions", help="most recent missions")
+    missions_parser.add_argument("-n", type=int, default=20)
+    benchmark_parser = commands.add_parser(
+        "benchmark", help="time reports over N made-up missions in a temporary db"
+    )
+    benchmark_parser.add_argument("n_missions", type=int)
+    args = parser.parse_args(argv)
+
+    if args.command == "benchmark":
+        with tempfile.TemporaryDirectory() as folder:
+            store = Store(os.path.join(folder, "history.db"))
+            rng = random.Random(0)
+            players = [f"players/{i}.png" for i in range(12)]
+            start = time.perf_counter()
+            for _ in range(args.n_missions):
+                store.add(_random_record(rng, players))
+            store.flush()
+            written = time.perf_counter() - start
+            elapsed = _report(store)
+            store.close()
+        print(f"write: {args.n_missions / written:,.0f} missions/s")
+        print(f"report: {elapsed * 1000:.1f} ms")
+        return
+
+    store = Store(args.db)
+    try:
+        if args.command == "report":
+            elapsed = _report(store)
+            print(f"({store.mission_count()} missions, {elapsed * 1000:.1f} ms)")
+        else:
+            for row in store.missions(args.n):
+                _, seed, played_at, n_players, n_tasks, success = row
+                when = time.strftime("%Y-%m-%d %H:%M", time.localtime(played_at))
+                result = "won" if success else "lost"
+                print(
+                    f"{when}  seed {seed}:"
+                    f" {n_players} players, {n_tasks} tasks, {result}"
+                )
+    finally:
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
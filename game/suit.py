@@ -2,8 +2,8 @@ from enum import Enum
 import functools
 
 
-_SUIT_SYMBOLS = "♠♥♣♦★"
-_SUIT_COLOURS = ["#568fc1", "#995362", "#77ac70", "#bf90dc", "#ffeeb0"]
+_SUIT_SYMBOLS = "♠♥♣♦★▲"
+_SUIT_COLOURS = ["#568fc1", "#995362", "#77ac70", "#bf90dc", "#ffeeb0", "#9a9a9a"]
 
 
 @functools.total_ordering
@@ -14,6 +14,12 @@ class Suit(Enum):
     CLUBS = 2
     DIAMONDS = 3
     SPECIAL = 4
+    ROCKET = 5
+
+    @property
+    def code(self):
+        """Dense integer code, 0 to 5."""
+        return self.value
 
     @property
     def symbol(self):
@@ -23,11 +29,6 @@ class Suit(Enum):
     def colour(self):
         return _SUIT_COLOURS[self.value]
 
-    def __eq__(self, other):
-        if not isinstance(other, Suit):
-            return NotImplemented
-        return self.value == other.value
-
     def __lt__(self, other):
         if not isinstance(other, Suit):
             return NotImplemented
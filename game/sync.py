@@ -0,0 +1,433 @@
+"""
+Mirror the mission board to browsers, such as phones and tablets at the table.
+
+SyncServer only listens on 127.0.0.1 unless given another host, so by
+default only this computer can follow along. Other devices on the
+network need the server started with host "0.0.0.0" (main.py --host
+0.0.0.0), which lets anyone on that network see the board.
+
+SyncServer runs an asyncio HTTP server on its own thread. Browsers load
+a small page from / which follows /events, a stream of server-sent
+events: one full snapshot of the board on connecting, then deltas
+holding only the slots (and players or seed) that changed.
+
+The GUI calls publish() with the latest board from the Tk thread. That
+only stores the board and wakes the server loop; the diffing, encoding
+and sending all happen on the server thread. Boards published in quick
+succession are coalesced, so a burst of clicks becomes one push. Each
+delta is encoded once and written to every client, and clients that
+stop reading are dropped rather than buffered for.
+
+Usage: python -m game.sync --load-test [CLIENTS]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import threading
+import time
+
+from game.mission import Mission
+from game.players import BLANK_PLAYER
+from game.task import Task
+
+
+DEFAULT_PORT = 8765
+
+MAX_BUFFER = 1 << 20
+"""Bytes a client can fall behind by before it's disconnected."""
+
+_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>the crew v2</title>
+<style>
+body { background: #d9d9d9; font-family: sans-serif; margin: 8px; }
+#board { display: grid; grid-template-columns: repeat(3, 1fr); gap: 8px; }
+.task { background: #fff; border-radius: 6px; padding: 6px; min-height: 3em; }
+.card { font-size: 2em; margin-right: 0.3em; }
+.done { color: #4f4f4f !important; text-decoration: line-through; }
+.assignee { font-size: 0.8em; color: #555; }
+</style>
+</head>
+<body>
+<div id="seed"></div>
+<div id="board"></div>
+<script>
+let board = {seed: "", players: [], slots: {}};
+function render() {
+  document.getElementById("seed").textContent = "seed " + board.seed;
+  const root = document.getElementById("board");
+  root.innerHTML = "";
+  for (let i = 0; i < board.size; i++) {
+    const div = document.createElement("div");
+    div.className = "task";
+    const task = board.slots[i];
+    if (task) {
+      task.cards.forEach(([text, colour], j) => {
+        const span = document.createElement("span");
+        span.className = "card" + (task.done >> j & 1 ? " done" : "");
+        span.style.color = colour;
+        span.textContent = text;
+        div.appendChild(span);
+      });
+      const who = document.createElement("div");
+      who.className = "assignee";
+      who.textContent = task.assignee || "";
+      div.appendChild(who);
+    }
+    root.appendChild(div);
+  }
+}
+const events = new EventSource("/events");
+events.addEventListener("snapshot", (event) => {
+  board = JSON.parse(event.data);
+  render();
+});
+events.addEventListener("delta", (event) => {
+  const delta = JSON.parse(event.data);
+  for (const [slot, task] of Object.entries(delta.slots || {})) {
+    if (task === null) delete board.slots[slot]; else board.slots[slot] = task;
+  }
+  // Anything else (seed, size, players) replaces the old value
+  for (const [key, value] of Object.entries(delta)) {
+    if (key !== "slots") board[key] = value;
+  }
+  render();
+});
+</script>
+</body>
+</html>
+"""
+
+
+def board_state(mission: Mission, slots: dict[int, Task], size: int = 15):
+    """The board as sent to clients: plain data, ready for JSON."""
+    return {
+        "seed": str(mission.seed),
+        "size": size,
+        "players": [
+            player.id for player in mission.players if player is not BLANK_PLAYER
+        ],
+        "slots": {
+            str(slot): {
+                "cards": [[str(card), card.suit.colour] for card in task.cards],
+                "done": task.done,
+                "assignee": (
+                    None if task.assignee is BLANK_PLAYER else task.assignee.id
+                ),
+            }
+            for slot, task in slots.items()
+        },
+    }
+
+
+def delta(old: dict, new: dict):
+    """What changed from old to new, with removed slots set to None."""
+    changes = {
+        key: value
+        for key, value in new.items()
+        if key != "slots" and old.get(key) != value
+    }
+    old_slots = old.get("slots", {})
+    new_slots = new["slots"]
+    slots = {
+        slot: task for slot, task in new_slots.items() if old_slots.get(slot) != task
+    }
+    for slot in old_slots:
+        if slot not in new_slots:
+            slots[slot] = None
+    if slots:
+        changes["slots"] = slots
+    return changes
+
+
+def _event(kind: str, seq: int, data: dict):
+    payload = json.dumps(data, separators=(",", ":"))
+    return f"id: {seq}\nevent: {kind}\ndata: {payload}\n\n".encode()
+
+
+class SyncServer:
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = DEFAULT_PORT,
+        coalesce: float = 0.05,
+    ):
+        self.host = host
+        self.port = port
+        """Port being served on, once started (useful when given 0)."""
+        self.coalesce = coalesce
+        """Seconds to wait for further changes before pushing one."""
+        self.seq = 0
+        self.pushes = 0
+        self._board: dict = {"seed": "", "size": 0, "players": [], "slots": {}}
+        self._latest: dict | None = None
+        self._lock = threading.Lock()
+        self._clients: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stop: asyncio.Event | None = None
+        self._thread: threading.Thread | None = None
+        self._started = threading.Event()
+        self._error: BaseException | None = None
+
+    @property
+    def client_count(self):
+        return len(self._clients)
+
+    def start(self):
+        """Start serving on a background thread, waiting until it's listening."""
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self._started.wait()
+        if self._error is not None:
+            raise self._error
+
+    def close(self):
+        if self._thread is None:
+            return
+        self._loop.call_soon_threadsafe(self._stop.set)
+        self._thread.join()
+        self._thread = None
+
+    def publish(self, board: dict):
+        """
+        Push board (from board_state()) to clients.
+
+        Safe to call from any thread, and cheap: the work happens on the
+        server thread, after waiting a moment for further changes.
+        """
+        with self._lock:
+            scheduled = self._latest is not None
+            self._latest = board
+        if not scheduled and self._loop is not None:
+            self._loop.call_soon_threadsafe(
+                self._loop.call_later, self.coalesce, self._push
+            )
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except BaseException as error:
+            self._error = error
+            self._started.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        server = await asyncio.start_server(
+            self._handle, self.host, self.port, backlog=1024
+        )
+        self.port = server.sockets[0].getsockname()[1]
+        self._started.set()
+        async with server:
+            await self._stop.wait()
+            for writer in list(self._clients):
+                writer.close()
+            # Let handlers see their clients go, rather than be cancelled
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    def _push(self):
+        with self._lock:
+            board, self._latest = self._latest, None
+        if board is None:
+            return
+        changes = delta(self._board, board)
+        self._board = board
+        if not changes:
+            return
+        self.seq += 1
+        self.pushes += 1
+        data = _event("delta", self.seq, changes)
+        for writer in list(self._clients):
+            self._send(writer, data)
+
+    def _send(self, writer: asyncio.StreamWriter, data: bytes):
+        if writer.transport.get_write_buffer_size() > MAX_BUFFER:
+            self._clients.discard(writer)
+            writer.close()
+            return
+        writer.write(data)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._handlers.add(asyncio.current_task())
+        try:
+            request = await reader.readline()
+            while (await reader.readline()).strip():
+                pass  # Headers aren't needed
+            parts = request.decode("latin-1").split()
+            path = parts[1] if len(parts) > 1 else "/"
+            if path == "/events":
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\n"
+                    b"Content-Type: text/event-stream\r\n"
+                    b"Cache-Control: no-cache\r\n"
+                    b"Connection: keep-alive\r\n\r\n"
+                )
+                writer.write(_event("snapshot", self.seq, self._board))
+                self._clients.add(writer)
+                # Nothing more is read; this just waits for the client to go
+                await reader.read()
+            elif path == "/":
+                self._respond(writer, "text/html; charset=utf-8", _PAGE.encode())
+            elif path == "/state":
+                body = json.dumps(self._board).encode()
+                self._respond(writer, "application/json", body)
+            else:
+                writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._clients.discard(writer)
+            self._handlers.discard(asyncio.current_task())
+            writer.close()
+
+    def _respond(self, writer: asyncio.StreamWriter, content_type: str, body: bytes):
+        writer.write(
+            f"HTTP/1.1 200 OK\r\nContent-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+        )
+        writer.write(body)
+
+
+async def _client(port: int, boards: list[dict], connected: asyncio.Event):
+    """
+    Follow /events, applying deltas, until the server closes the stream.
+
+    Deltas are applied the same way as by the page's script.
+    """
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    while (await reader.readline()).strip():
+        pass
+    board: dict = {}
+    received = 0
+    while True:
+        fields = {}
+        while True:
+            line = (await reader.readline()).decode()
+            if not line:
+                writer.close()
+                return board, received
+            if line == "\n":
+                break
+            name, _, value = line.rstrip("\n").partition(": ")
+            fields[name] = value
+        data = json.loads(fields["data"])
+        received += 1
+        if fields["event"] == "snapshot":
+            board = data
+            connected.set()
+        else:
+            slots = dict(board["slots"])
+            for slot, task in data.pop("slots", {}).items():
+                if task is None:
+                    slots.pop(slot, None)
+                else:
+                    slots[slot] = task
+            board = {**board, **data, "slots": slots}
+        boards[0] = board
+
+
+def load_test(n_clients: int, n_changes: int = 500, interval: float = 0.002):
+    """
+    Connect n_clients to a local server and publish n_changes boards.
+
+    Most clients connect before anything is published, so they start
+    from the server's empty board (as a browser opened before the
+    mission screen would). The rest connect halfway through. Returns a
+    dict of timings, after checking every client ended up with the
+    final board.
+    """
+    server = SyncServer("127.0.0.1", 0)
+    server.start()
+    mission = Mission(seed=0)
+    rng = random.Random(0)
+    slots: dict[int, Task] = {}
+
+    async def run():
+        boards = [[{}] for _ in range(n_clients)]
+        events = [asyncio.Event() for _ in range(n_clients)]
+        n_early = n_clients - n_clients // 4
+
+        def connect(clients: range):
+            return [
+                asyncio.create_task(_client(server.port, boards[i], events[i]))
+                for i in clients
+            ]
+
+        start = time.perf_counter()
+        tasks = connect(range(n_early))
+        for event in events[:n_early]:
+            await event.wait()
+        connected = time.perf_counter() - start
+        if any(client[0]["size"] != 0 for client in boards[:n_early]):
+            raise AssertionError("early clients should start from an empty board")
+
+        publish_time = 0.0
+        for i in range(n_changes):
+            if i == n_changes // 2:
+                tasks += connect(range(n_early, n_clients))
+            # Same sort of changes as clicking on the board
+            if len(slots) < 15 and rng.random() < 0.1:
+                mission.add_task(rng.randint(1, 2))
+                slots[len(slots)] = mission.tasks[-1]
+            elif slots:
+                task = rng.choice(list(slots.values()))
+                task.toggle_done(rng.randrange(len(task.cards)))
+            board = board_state(mission, slots)
+            begin = time.perf_counter()
+            server.publish(board)
+            publish_time += time.perf_counter() - begin
+            await asyncio.sleep(interval)
+        published = time.perf_counter()
+
+        final = json.loads(json.dumps(board))
+        while not all(client[0] == final for client in boards):
+            await asyncio.sleep(0.001)
+        delivered = time.perf_counter() - published
+        server.close()
+        results = await asyncio.gather(*tasks)
+        return connected, publish_time, delivered, results
+
+    connected, publish_time, delivered, results = asyncio.run(run())
+    return {
+        "clients": n_clients,
+        "late clients": n_clients // 4,
+        "connect": connected,
+        "publish": publish_time / n_changes,
+        "pushes": server.pushes,
+        "events": sum(received for _, received in results) / n_clients,
+        "final delivery": delivered,
+    }
+
+
+def main(argv: list[str] | None = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m game.sync",
+        description="Load test the board sync server with local clients.",
+    )
+    parser.add_argument("--load-test", type=int, default=300, metavar="CLIENTS")
+    parser.add_argument("--changes", type=int, default=500)
+    args = parser.parse_args(argv)
+    results = load_test(args.load_test, args.changes)
+    print(
+        f"{results['clients']} clients ({results['late clients']} joining halfway),"
+        f" the rest connected in {results['connect']:.2f} s"
+    )
+    print(f"publish(): {results['publish'] * 1e6:.1f} us per call")
+    print(
+        f"{args.changes} changes coalesced into {results['pushes']} pushes,"
+        f" {results['events']:.0f} events per client"
+    )
+    print(f"last change reached every client in {results['final delivery']:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,5 +5,13 @@ from game.players import BLANK_PLAYER
 class Task:
 
     def __init__(self, cards: list[Card]):
-        self.cards = sorted(cards)
+        self.cards = sorted(cards, key=Card.key)
         self.assignee = BLANK_PLAYER
+        self.done = 0
+        """Bitmask of completed cards; bit i is set if cards[i] is done."""
+
+    def is_done(self, index: int):
+        return bool(self.done >> index & 1)
+
+    def toggle_done(self, index: int):
+        self.done ^= 1 << index
@@ -1,4 +1,65 @@
+import argparse
+import time
+
+start = time.perf_counter()
+
 from ui.application import Application
 
+imported = time.perf_counter()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="the crew v2")
+    parser.add_argument(
+        "--timing",
+        action="store_true",
+        help="print import and first-frame times",
+    )
+    parser.add_argument(
+        "--history",
+        action="store_true",
+        help="save finished missions to query later (see python -m game.store)",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        nargs="?",
+        const=0,
+        metavar="PORT",
+        help="mirror the board to browsers, on PORT if given",
+    )
+    parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help=(
+            "address to serve on; only this computer can connect by default,"
+            " use 0.0.0.0 to let other devices on the network follow along"
+        ),
+    )
+    parser.add_argument(
+        "--stats",
+        metavar="FILE",
+        help="write handler latencies and event loop lag to FILE every 10 s",
+    )
+    args = parser.parse_args()
+
+    server = None
+    if args.serve is not None:
+        from game.sync import DEFAULT_PORT, SyncServer
+
+        server = SyncServer(host=args.host, port=args.serve or DEFAULT_PORT)
+        server.start()
+        print(f"mirroring the board on {args.host} port {server.port}")
+
+    store = None
+    if args.history:
+        from game.store import Store
+
+        store = Store()
 
-Application().start()
+    application = Application(store=store, server=server)
+    if args.timing:
+        application.report_startup(start, imported)
+    if args.stats is not None:
+        application.enable_stats(dump=args.stats)
+    application.start()
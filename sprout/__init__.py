@@ -7,9 +7,17 @@ Mini GUI package built on top of tkinter. It's not particularly complete
 https://github.com/Qzphs/sprout
 """
 
+import importlib
+
 __all__ = [
     "Application",
+    "Atlas",
     "CENTRE",
+    "Canvas",
+    "CanvasImage",
+    "CanvasItem",
+    "CanvasRect",
+    "CanvasText",
     "Container",
     "Dropdown",
     "E",
@@ -18,28 +26,81 @@ __all__ = [
     "Frame",
     "ImageLabel",
     "Image",
+    "IMAGE_CACHE",
+    "ImageCache",
+    "ImageLoader",
     "N",
     "NE",
     "NW",
     "OFFSCREEN",
+    "Pool",
     "S",
     "SE",
     "SW",
     "Screen",
     "ScrollableFrame",
+    "Stats",
     "TextLabel",
+    "VirtualGrid",
     "W",
     "Widget",
+    "build_atlas",
+    "clear_fonts",
+    "font_count",
+    "use_backend",
 ]
 
-from sprout.application import Application, Screen
-from sprout.constants import NW, N, NE, E, SE, S, SW, W, CENTRE, OFFSCREEN
-from sprout.dropdown import Dropdown
-from sprout.entry import Entry
-from sprout.font import Font
-from sprout.frame import Frame
-from sprout.image_label import ImageLabel
-from sprout.image import Image
-from sprout.scrollable_frame import ScrollableFrame
-from sprout.text_label import TextLabel
-from sprout.widget import Widget, Container
+# Submodules are only imported when one of their names is first used, to
+# keep importing sprout cheap.
+_LAZY = {
+    "Application": "sprout.application",
+    "Screen": "sprout.application",
+    "Atlas": "sprout.atlas",
+    "build_atlas": "sprout.atlas",
+    "use_backend": "sprout.backend",
+    "Canvas": "sprout.canvas",
+    "CanvasImage": "sprout.canvas",
+    "CanvasItem": "sprout.canvas",
+    "CanvasRect": "sprout.canvas",
+    "CanvasText": "sprout.canvas",
+    "NW": "sprout.constants",
+    "N": "sprout.constants",
+    "NE": "sprout.constants",
+    "E": "sprout.constants",
+    "SE": "sprout.constants",
+    "S": "sprout.constants",
+    "SW": "sprout.constants",
+    "W": "sprout.constants",
+    "CENTRE": "sprout.constants",
+    "OFFSCREEN": "sprout.constants",
+    "Dropdown": "sprout.dropdown",
+    "Entry": "sprout.entry",
+    "Font": "sprout.font",
+    "clear_fonts": "sprout.font",
+    "font_count": "sprout.font",
+    "Frame": "sprout.frame",
+    "ImageLabel": "sprout.image_label",
+    "Image": "sprout.image",
+    "IMAGE_CACHE": "sprout.image",
+    "ImageCache": "sprout.image",
+    "ImageLoader": "sprout.image_loader",
+    "Pool": "sprout.pool",
+    "ScrollableFrame": "sprout.scrollable_frame",
+    "Stats": "sprout.stats",
+    "TextLabel": "sprout.text_label",
+    "VirtualGrid": "sprout.virtual_grid",
+    "Widget": "sprout.widget",
+    "Container": "sprout.widget",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY:
+        raise AttributeError(f"module 'sprout' has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY[name]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
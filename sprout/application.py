@@ -1,6 +1,9 @@
 import tkinter
+from typing import Callable
 
+from sprout import backend
 from sprout.constants import OFFSCREEN
+from sprout.stats import Stats
 from sprout.widget import Container, Widget
 
 
@@ -11,45 +14,202 @@ class Application:
     Single-screen GUIs can use the default screen (self.screen)
     directly. Multi-screen GUIs can create their own screens and
     show/hide them using self.change_screen().
+
+    Widget property changes are batched: config() records them and
+    they're applied together once the event loop is idle, skipping
+    any that wouldn't change anything. Call flush() to apply them
+    immediately.
+
+    Call enable_stats() to time every on_click/on_write handler and
+    measure event loop lag.
     """
 
     def __init__(self, title: str, width: int, height: int):
-        self.tk = tkinter.Tk()
+        self.tk = backend.tk.Tk()
         self.tk.title(title)
         self.tk.geometry(f"{width}x{height}+{0}+{0}")
         self.width = width
         self.height = height
+        self._pending: dict[tkinter.Misc, dict[str, object]] = {}
+        self._known: dict[tkinter.Misc, dict[str, object]] = {}
+        self._flush_scheduled = False
+        self.stats: Stats | None = None
         self.screen = Screen(self)
         self.screen.place(x=0, y=0)
 
+    def config(self, widget: tkinter.Misc, **options):
+        """Schedule widget.config(**options) for the next flush."""
+        pending = self._pending.get(widget)
+        known = self._known.get(widget, {})
+        for option, value in options.items():
+            if pending is not None and option in pending:
+                pending[option] = value
+            elif option in known and known[option] == value:
+                continue
+            else:
+                if pending is None:
+                    pending = self._pending[widget] = {}
+                pending[option] = value
+        if pending and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.tk.after_idle(self.flush)
+
+    def cget(self, widget: tkinter.Misc, option: str):
+        """Same as widget.cget(option), but includes unflushed changes."""
+        pending = self._pending.get(widget)
+        if pending is not None and option in pending:
+            return pending[option]
+        known = self._known.setdefault(widget, {})
+        if option not in known:
+            known[option] = widget.cget(option)
+        return known[option]
+
+    def flush(self):
+        """Apply all scheduled config changes now."""
+        self._flush_scheduled = False
+        pending, self._pending = self._pending, {}
+        for widget, options in pending.items():
+            known = self._known.setdefault(widget, {})
+            changed = {
+                option: value
+                for option, value in options.items()
+                if option not in known or known[option] != value
+            }
+            if not changed:
+                continue
+            widget.config(**changed)
+            known.update(changed)
+
+    def forget(self, widget: tkinter.Misc):
+        """Drop scheduled and cached state for widget and its children."""
+        self._pending.pop(widget, None)
+        self._known.pop(widget, None)
+        for child in widget.children.values():
+            self.forget(child)
+
     def change_screen(self, screen: "Screen"):
         self.screen.place(x=OFFSCREEN, y=0)
         self.screen = screen
         self.screen.place(x=0, y=0)
 
+    def enable_stats(self, heartbeat: int = 100, dump: str | None = None):
+        """
+        Start recording handler latencies and event loop lag.
+
+        The heartbeat runs every heartbeat milliseconds. If dump is
+        given, a report is written there every 10 seconds.
+        """
+        if self.stats is None:
+            self.stats = Stats(self, heartbeat)
+            self.stats.start()
+        if dump is not None:
+            self.stats.dump_every(dump)
+        return self.stats
+
+    def disable_stats(self):
+        if self.stats is not None:
+            self.stats.stop()
+            self.stats = None
+
     def start(self):
         self.tk.mainloop()
 
 
 class Screen(Container):
+    """
+    A full-window page of widgets.
+
+    Besides each widget's own on_click, a screen can handle clicks by
+    delegation: delegate() files a widget under an owner and a role,
+    and handle() sets what each role does in each mode. All of it goes
+    through one binding, and changing self.mode changes what every
+    delegated widget does without touching any of them.
+    """
 
     def __init__(self, parent: Application):
         self.parent = parent
-        self.base = tkinter.Frame(
+        self.application = parent
+        self.base = backend.tk.Frame(
             parent.tk,
             width=parent.width,
             height=parent.height,
         )
         self.frame = self.base
         self.children: list[Widget] = []
+        self.mode: str | None = None
+        self._owners: dict[tkinter.Misc, tuple[Widget, object, str]] = {}
+        self._handlers: dict[tuple[str | None, str], Callable] = {}
+
+    def delegate(self, widget: Widget, owner: object, role: str):
+        """
+        Route clicks on widget (or anything inside it) to this screen.
+
+        They go to the handler for role in the current mode, called as
+        handler(owner, widget). Clicks reach the innermost delegated
+        widget.
+        """
+        if not self._owners:
+            self.application.tk.bind_all("<Button-1>", self._on_click, add="+")
+        self._owners[widget.base] = (widget, owner, role)
+
+    def undelegate(self, widget: Widget):
+        self._owners.pop(widget.base, None)
+
+    def handle(self, mode: str | None, role: str, handler: Callable | None):
+        """Set what clicking a widget with role does in mode."""
+        if handler is None:
+            self._handlers.pop((mode, role), None)
+        else:
+            self._handlers[(mode, role)] = handler
+
+    def _on_click(self, event: tkinter.Event):
+        if self.application.screen is not self:
+            return
+        tk_widget = event.widget
+        while tk_widget is not None and tk_widget not in self._owners:
+            # Tk gives a plain name for widgets tkinter didn't create
+            tk_widget = getattr(tk_widget, "master", None)
+        if tk_widget is None:
+            return
+        widget, owner, role = self._owners[tk_widget]
+        self.dispatch(role, owner, widget)
+
+    def dispatch(self, role: str, owner: object, source: object):
+        """
+        Call the handler for role in the current mode, if there is one.
+
+        This is what a click on a delegated widget does, for sources of
+        clicks that aren't widgets (such as canvas items).
+        """
+        handler = self._handlers.get((self.mode, role))
+        if handler is None:
+            return
+        stats = self.application.stats
+        if stats is None:
+            handler(owner, source)
+        else:
+            stats.dispatch(handler, owner, source)
+
+    def bind_key(self, sequence: str, callback: Callable[[], None]):
+        """
+        Call callback when sequence (e.g. "<Control-z>") is pressed.
+
+        Only fires while this screen is the one being shown.
+        """
+
+        def on_key(event: tkinter.Event):
+            if self.application.screen is self:
+                callback()
+
+        self.application.tk.bind(sequence, on_key, add="+")
 
     @property
     def background_colour(self):
-        return self.base.cget("bg")
+        return self._cget(self.base, "bg")
 
     @background_colour.setter
     def background_colour(self, background_colour: str | None):
         if background_colour is None:
-            self.base.config(bg=self.parent.tk.cget("bg"))
+            self._config(self.base, bg=self._cget(self.parent.tk, "bg"))
         else:
-            self.base.config(bg=background_colour)
+            self._config(self.base, bg=background_colour)
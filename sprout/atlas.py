@@ -0,0 +1,399 @@
+"""
+Sprite atlases: many small images packed into one PNG.
+
+build_atlas() is an asset build step. It packs source PNGs into one
+sheet, each at several sizes (mip levels), and writes a JSON index of
+where every image is. Sources that haven't changed since the last build
+are copied across from the old sheet rather than decoded again. Atlas
+then loads the sheet with a single decode and cuts images out of it.
+
+The index is written after the sheet, and records the sheet's mtime and
+size. An index that doesn't match its sheet (say, the build was stopped
+between the two) is ignored, as if there were no atlas.
+
+PNGs are read and written here in pure Python (with zlib), so building
+needs neither Tk nor Pillow. Only 8-bit, non-interlaced PNGs are
+supported, which covers what image editors and browsers save.
+"""
+
+import argparse
+import json
+import os
+import struct
+import zlib
+
+from sprout import backend
+from sprout.image import Image
+
+
+ATLAS_COLUMNS = 16
+"""Images per row of the sheet."""
+
+_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Bytes per pixel for each PNG colour type, at 8 bits per sample
+_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def read_png(filename: str):
+    """Decode filename to (width, height, RGBA pixels)."""
+    with open(filename, "rb") as file:
+        data = file.read()
+    if not data.startswith(_SIGNATURE):
+        raise ValueError(f"{filename} is not a PNG")
+    header = None
+    palette = b""
+    transparency = b""
+    compressed = []
+    pos = len(_SIGNATURE)
+    while pos < len(data):
+        length, kind = struct.unpack(">I4s", data[pos : pos + 8])
+        chunk = data[pos + 8 : pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IHDR":
+            header = struct.unpack(">IIBBBBB", chunk)
+        elif kind == b"PLTE":
+            palette = chunk
+        elif kind == b"tRNS":
+            transparency = chunk
+        elif kind == b"IDAT":
+            compressed.append(chunk)
+        elif kind == b"IEND":
+            break
+    if header is None:
+        raise ValueError(f"{filename} has no header")
+    width, height, depth, colour_type, _, _, interlace = header
+    if depth != 8 or interlace or colour_type not in _CHANNELS:
+        raise ValueError(
+            f"{filename}: only 8-bit, non-interlaced PNGs are supported"
+        )
+    pixels = _unfilter(
+        zlib.decompress(b"".join(compressed)),
+        width,
+        height,
+        _CHANNELS[colour_type],
+    )
+    return width, height, _to_rgba(pixels, colour_type, palette, transparency)
+
+
+def _unfilter(raw: bytes, width: int, height: int, bpp: int):
+    stride = width * bpp
+    pixels = bytearray(stride * height)
+    previous = bytearray(stride)
+    pos = 0
+    for y in range(height):
+        kind = raw[pos]
+        line = raw[pos + 1 : pos + 1 + stride]
+        pos += 1 + stride
+        if kind != 0:
+            # Lines with no filter (every line of a sheet written here) are
+            # used as they are
+            line = bytearray(line)
+        if kind == 1:
+            for i in range(bpp, stride):
+                line[i] = (line[i] + line[i - bpp]) & 0xFF
+        elif kind == 2:
+            for i in range(stride):
+                line[i] = (line[i] + previous[i]) & 0xFF
+        elif kind == 3:
+            for i in range(stride):
+                left = line[i - bpp] if i >= bpp else 0
+                line[i] = (line[i] + (left + previous[i]) // 2) & 0xFF
+        elif kind == 4:
+            for i in range(stride):
+                a = line[i - bpp] if i >= bpp else 0
+                b = previous[i]
+                c = previous[i - bpp] if i >= bpp else 0
+                p = a + b - c
+                pa = abs(p - a)
+                pb = abs(p - b)
+                pc = abs(p - c)
+                if pa <= pb and pa <= pc:
+                    line[i] = (line[i] + a) & 0xFF
+                elif pb <= pc:
+                    line[i] = (line[i] + b) & 0xFF
+                else:
+                    line[i] = (line[i] + c) & 0xFF
+        elif kind > 4:
+            raise ValueError(f"unknown PNG filter {kind}")
+        pixels[y * stride : (y + 1) * stride] = line
+        previous = line
+    return pixels
+
+
+def _to_rgba(pixels: bytearray, colour_type: int, palette: bytes, transparency: bytes):
+    if colour_type == 6:
+        return pixels
+    if colour_type == 3:
+        alphas = transparency + b"\xff" * (256 - len(transparency))
+        table = [palette[i * 3 : i * 3 + 3] + alphas[i : i + 1] for i in range(256)]
+        return bytearray(b"".join(table[i] for i in pixels))
+    n = len(pixels) // _CHANNELS[colour_type]
+    rgba = bytearray(b"\xff" * (n * 4))
+    if colour_type == 2:
+        for c in range(3):
+            rgba[c::4] = pixels[c::3]
+    elif colour_type == 0:
+        for c in range(3):
+            rgba[c::4] = pixels
+    else:
+        for c in range(3):
+            rgba[c::4] = pixels[0::2]
+        rgba[3::4] = pixels[1::2]
+    return rgba
+
+
+def write_png(filename: str, width: int, height: int, rgba: bytes):
+    """
+    Encode RGBA pixels to filename, replacing it atomically.
+
+    Compression is light, as atlases are a cache: level 9 takes about
+    seven times as long, for a file two thirds the size.
+    """
+    stride = width * 4
+    raw = b"".join(
+        b"\x00" + rgba[y * stride : (y + 1) * stride] for y in range(height)
+    )
+
+    def chunk(kind: bytes, body: bytes):
+        crc = zlib.crc32(kind + body)
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+    data = (
+        _SIGNATURE
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw, 1))
+        + chunk(b"IEND", b"")
+    )
+    temporary = f"{filename}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(data)
+    os.replace(temporary, filename)
+
+
+def _halve(width: int, height: int, pixels: bytearray):
+    """Pixels at half size, averaging each 2x2 block."""
+    half_width = width // 2
+    half_height = height // 2
+    stride = width * 4
+    halved = bytearray(half_width * half_height * 4)
+    o = 0
+    for y in range(half_height):
+        top = 2 * y * stride
+        bottom = top + stride
+        for x in range(half_width):
+            i = top + 8 * x
+            j = bottom + 8 * x
+            for c in range(4):
+                halved[o + c] = (
+                    pixels[i + c]
+                    + pixels[i + 4 + c]
+                    + pixels[j + c]
+                    + pixels[j + 4 + c]
+                    + 2
+                ) >> 2
+            o += 4
+    return half_width, half_height, halved
+
+
+def _scale(width: int, height: int, pixels: bytearray, size: int):
+    """
+    Pixels scaled to size x size.
+
+    Halving is used for as long as it doesn't go below size, then
+    nearest neighbour for whatever is left (nothing, for square images
+    at power-of-two sizes).
+    """
+    while (
+        width >= 2 * size and height >= 2 * size and width % 2 == 0 and height % 2 == 0
+    ):
+        width, height, pixels = _halve(width, height, pixels)
+    if width == size and height == size:
+        return pixels
+    scaled = bytearray(size * size * 4)
+    for y in range(size):
+        row = (y * height // size) * width
+        for x in range(size):
+            i = (row + x * width // size) * 4
+            o = (y * size + x) * 4
+            scaled[o : o + 4] = pixels[i : i + 4]
+    return scaled
+
+
+def index_path(path: str):
+    """Where the index for the atlas at path is kept."""
+    return f"{os.path.splitext(path)[0]}.json"
+
+
+def _sheet_stamp(path: str):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "bytes": stat.st_size}
+
+
+def load_index(path: str):
+    """
+    The index of the atlas at path.
+
+    Raises OSError if it's missing, and ValueError if it's unreadable or
+    doesn't match the sheet.
+    """
+    with open(index_path(path), encoding="utf-8") as file:
+        index = json.load(file)
+    if not isinstance(index, dict) or index.get("sheet") != _sheet_stamp(path):
+        raise ValueError(f"{index_path(path)} doesn't match {path}")
+    return index
+
+
+def _load_index(path: str, sizes: list[int]):
+    try:
+        index = load_index(path)
+    except (OSError, ValueError):
+        return None
+    if index.get("sizes") != sizes:
+        return None
+    return index
+
+
+def build_atlas(
+    sources: list[str], path: str, sizes: tuple[int, ...] = (128, 64, 32)
+):
+    """
+    Pack sources into the atlas at path, if any have changed.
+
+    Each source gets a cell sizes[0] wide, with its mip levels stacked
+    down it. Returns True if the atlas was (re)written.
+    """
+    sizes = list(sizes)
+    stamps = {}
+    for source in sources:
+        stat = os.stat(source)
+        stamps[source] = {"mtime": stat.st_mtime, "bytes": stat.st_size}
+    old = _load_index(path, sizes)
+    old_sources = {} if old is None else old["sources"]
+    if list(old_sources) == list(sources) and all(
+        old_sources[source]["mtime"] == stamp["mtime"]
+        and old_sources[source]["bytes"] == stamp["bytes"]
+        for source, stamp in stamps.items()
+    ):
+        return False
+
+    reused = [
+        source
+        for source, stamp in stamps.items()
+        if source in old_sources
+        and old_sources[source]["mtime"] == stamp["mtime"]
+        and old_sources[source]["bytes"] == stamp["bytes"]
+    ]
+    old_sheet = read_png(path) if reused else None
+
+    cell_width = sizes[0]
+    cell_height = sum(sizes)
+    columns = max(1, min(len(sources), ATLAS_COLUMNS))
+    rows = -(-len(sources) // columns)
+    sheet_width = columns * cell_width
+    sheet = bytearray(sheet_width * rows * cell_height * 4)
+
+    def blit(x: int, y: int, size: int, pixels: bytes):
+        for row in range(size):
+            start = ((y + row) * sheet_width + x) * 4
+            sheet[start : start + size * 4] = pixels[
+                row * size * 4 : (row + 1) * size * 4
+            ]
+
+    def cut(x: int, y: int, size: int):
+        old_width, _, old_pixels = old_sheet
+        rows = []
+        for row in range(size):
+            start = ((y + row) * old_width + x) * 4
+            rows.append(old_pixels[start : start + size * 4])
+        return b"".join(rows)
+
+    entries = {}
+    for i, source in enumerate(sources):
+        row, column = divmod(i, columns)
+        x = column * cell_width
+        y = row * cell_height
+        offsets = {}
+        if source in reused:
+            for size in sizes:
+                old_x, old_y = old_sources[source]["offsets"][str(size)]
+                blit(x, y, size, cut(old_x, old_y, size))
+                offsets[str(size)] = [x, y]
+                y += size
+        else:
+            width, height, pixels = read_png(source)
+            for size in sizes:
+                pixels = _scale(width, height, pixels, size)
+                width = height = size
+                blit(x, y, size, pixels)
+                offsets[str(size)] = [x, y]
+                y += size
+        entries[source] = {**stamps[source], "offsets": offsets}
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_png(path, sheet_width, rows * cell_height, sheet)
+    index = {"sizes": sizes, "sheet": _sheet_stamp(path), "sources": entries}
+    temporary = f"{index_path(path)}.tmp"
+    with open(temporary, "w", encoding="utf-8") as file:
+        json.dump(index, file, indent=1)
+    os.replace(temporary, index_path(path))
+    return True
+
+
+class Atlas:
+    """
+    Images cut from a sheet made by build_atlas().
+
+    The sheet is decoded once, when an image is first asked for. Each
+    image is cut out the first time it's asked for and then kept.
+
+    Raises OSError if there's no atlas at path, and ValueError if its
+    index doesn't match its sheet. Only the index is read here, so this
+    can be made off the Tk thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        index = load_index(path)
+        self.sizes: list[int] = index["sizes"]
+        self._offsets: dict[str, dict[str, list[int]]] = {
+            source: entry["offsets"] for source, entry in index["sources"].items()
+        }
+        self._sheet: Image | None = None
+        self._images: dict[tuple[str, int], Image] = {}
+
+    def __contains__(self, source: str):
+        return source in self._offsets
+
+    def __len__(self):
+        return len(self._offsets)
+
+    def image(self, source: str, size: int):
+        """
+        The image for source at one of the atlas's sizes.
+
+        Raises KeyError if source isn't in the atlas or size isn't one
+        of its sizes.
+        """
+        key = (source, size)
+        image = self._images.get(key)
+        if image is None:
+            x, y = self._offsets[source][str(size)]
+            if self._sheet is None:
+                self._sheet = Image(backend.tk.PhotoImage(file=self.path))
+            image = self._images[key] = self._sheet.crop(x, y, x + size, y + size)
+        return image
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack PNGs into a sprite atlas.")
+    parser.add_argument("atlas", help="PNG to write (index goes alongside)")
+    parser.add_argument("sources", nargs="+", help="PNGs to pack")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[128, 64, 32], help="mip levels"
+    )
+    arguments = parser.parse_args()
+    if build_atlas(arguments.sources, arguments.atlas, tuple(arguments.sizes)):
+        print(f"wrote {arguments.atlas} and {index_path(arguments.atlas)}")
+    else:
+        print(f"{arguments.atlas} is up to date")
@@ -0,0 +1,33 @@
+"""
+The toolkit Sprout widgets are built with.
+
+Sprout modules look up tk and font here at call time rather than
+importing tkinter directly, so the backend can be swapped for
+sprout.headless. Choose the backend before creating an Application.
+"""
+
+import os
+import tkinter
+import tkinter.font
+
+
+tk = tkinter
+font = tkinter.font
+
+
+def use_backend(name: str):
+    """Switch between the "tkinter" and "headless" backends."""
+    global tk, font
+    if name == "tkinter":
+        tk = tkinter
+        font = tkinter.font
+    elif name == "headless":
+        from sprout import headless
+
+        tk = headless
+        font = headless
+    else:
+        raise ValueError(f"unknown backend {name!r}")
+
+
+use_backend(os.environ.get("SPROUT_BACKEND", "tkinter"))
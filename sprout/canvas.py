@@ -0,0 +1,244 @@
+import tkinter
+from typing import Callable
+
+from sprout import backend
+from sprout.constants import CENTRE, W
+from sprout.font import Font
+from sprout.image import Image
+from sprout.widget import Container, Widget
+
+
+class CanvasItem:
+    """
+    Something drawn on a Canvas.
+
+    Items are kept between redraws: changing a property updates just
+    that item, and only if the value actually changed. owner and role
+    are free for the application to use, e.g. to decide what clicking
+    the item does; items without a role are ignored by Canvas.hit().
+    """
+
+    def __init__(self, canvas: "Canvas", id: int, coords: tuple, options: dict):
+        self.canvas = canvas
+        self.id = id
+        self.owner: object = None
+        self.role: str | None = None
+        self._coords = coords
+        self._options = options
+        canvas.items[id] = self
+
+    def _set(self, **options):
+        changed = {
+            option: value
+            for option, value in options.items()
+            if self._options.get(option) != value
+        }
+        if changed:
+            self.canvas.base_canvas.itemconfig(self.id, **changed)
+            self._options.update(changed)
+
+    def _move(self, *coords: float):
+        if coords != self._coords:
+            self.canvas.base_canvas.coords(self.id, *coords)
+            self._coords = coords
+
+    @property
+    def visible(self):
+        return self._options.get("state") != tkinter.HIDDEN
+
+    def show(self):
+        self._set(state=tkinter.NORMAL)
+
+    def hide(self):
+        self._set(state=tkinter.HIDDEN)
+
+    def delete(self):
+        self.canvas.base_canvas.delete(self.id)
+        del self.canvas.items[self.id]
+
+
+class CanvasRect(CanvasItem):
+
+    def move(self, x1: float, y1: float, x2: float, y2: float):
+        self._move(x1, y1, x2, y2)
+
+    @property
+    def fill(self) -> str | None:
+        return self._options.get("fill") or None
+
+    @fill.setter
+    def fill(self, fill: str | None):
+        self._set(fill=fill or "")
+
+    @property
+    def outline(self) -> str | None:
+        return self._options.get("outline") or None
+
+    @outline.setter
+    def outline(self, outline: str | None):
+        self._set(outline=outline or "")
+
+    @property
+    def outline_width(self):
+        return self._options.get("width", 1)
+
+    @outline_width.setter
+    def outline_width(self, width: int):
+        self._set(width=width)
+
+
+class CanvasText(CanvasItem):
+
+    def __init__(self, canvas: "Canvas", id: int, coords: tuple, options: dict):
+        super().__init__(canvas, id, coords, options)
+        self._font: Font | None = None
+
+    def move(self, x: float, y: float):
+        self._move(x, y)
+
+    @property
+    def text(self) -> str:
+        return self._options.get("text", "")
+
+    @text.setter
+    def text(self, text: str):
+        self._set(text=text)
+
+    @property
+    def colour(self) -> str:
+        return self._options.get("fill", "")
+
+    @colour.setter
+    def colour(self, colour: str):
+        self._set(fill=colour)
+
+    @property
+    def font(self):
+        return self._font
+
+    @font.setter
+    def font(self, font: Font):
+        if font == self._font:
+            return
+        self._font = font
+        self._set(font=font.tkinter())
+
+    @property
+    def width(self):
+        """Width of the text in pixels, with the current font."""
+        if self._font is None:
+            return 0
+        return self._font.measure(self.text)
+
+
+class CanvasImage(CanvasItem):
+
+    def __init__(self, canvas: "Canvas", id: int, coords: tuple, options: dict):
+        super().__init__(canvas, id, coords, options)
+        self._image: Image | None = None
+
+    def move(self, x: float, y: float):
+        self._move(x, y)
+
+    @property
+    def image(self):
+        return self._image
+
+    @image.setter
+    def image(self, image: Image):
+        # Also keeps the PhotoImage alive while it's displayed
+        self._image = image
+        self._set(image=image.base)
+
+
+class Canvas(Widget):
+    """
+    Retained-mode drawing surface: one tkinter.Canvas holding items.
+
+    A grid of rectangles, text and images here costs one Tk widget
+    rather than one (or several) per element, and nothing needs the
+    geometry manager. Clicks go to on_click with the topmost item under
+    the pointer that has a role.
+    """
+
+    def __init__(self, parent: Container, width: int, height: int):
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self.base_canvas = backend.tk.Canvas(
+            self.base, width=width, height=height, bd=0, highlightthickness=0
+        )
+        self.base_canvas.pack()
+        self.base_canvas.bind("<Button-1>", self._on_click)
+        self.items: dict[int, CanvasItem] = {}
+        self.on_click: Callable[[CanvasItem], None] | None = None
+
+    @property
+    def background_colour(self):
+        return self._cget(self.base_canvas, "bg")
+
+    @background_colour.setter
+    def background_colour(self, colour: str):
+        self._config(self.base_canvas, bg=colour)
+
+    def rect(
+        self,
+        x1: float,
+        y1: float,
+        x2: float,
+        y2: float,
+        fill: str | None = None,
+        outline: str | None = None,
+        outline_width: int = 1,
+    ):
+        options = {
+            "fill": fill or "",
+            "outline": outline or "",
+            "width": outline_width,
+        }
+        id = self.base_canvas.create_rectangle(x1, y1, x2, y2, **options)
+        return CanvasRect(self, id, (x1, y1, x2, y2), options)
+
+    def text(
+        self,
+        x: float,
+        y: float,
+        text: str = "",
+        font: Font | None = None,
+        colour: str = "#000000",
+        anchor: str = W,
+    ):
+        options = {"text": text, "fill": colour, "anchor": anchor}
+        if font is not None:
+            options["font"] = font.tkinter()
+        id = self.base_canvas.create_text(x, y, **options)
+        item = CanvasText(self, id, (x, y), options)
+        item._font = font
+        return item
+
+    def image(self, x: float, y: float, image: Image, anchor: str = CENTRE):
+        options = {"image": image.base, "anchor": anchor}
+        id = self.base_canvas.create_image(x, y, **options)
+        item = CanvasImage(self, id, (x, y), options)
+        item._image = image
+        return item
+
+    def hit(self, x: float, y: float):
+        """Topmost visible item at (x, y) with a role, if any."""
+        for id in reversed(self.base_canvas.find_overlapping(x, y, x, y)):
+            item = self.items.get(id)
+            if item is not None and item.role is not None and item.visible:
+                return item
+        return None
+
+    def _on_click(self, event: tkinter.Event):
+        if self.on_click is None:
+            return
+        item = self.hit(event.x, event.y)
+        if item is None:
+            return
+        stats = self.application.stats
+        if stats is None:
+            self.on_click(item)
+        else:
+            stats.dispatch(self.on_click, item)
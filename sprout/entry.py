@@ -1,6 +1,7 @@
 import tkinter
 from typing import Callable
 
+from sprout import backend
 from sprout.font import Font
 from sprout.widget import Widget
 
@@ -10,25 +11,28 @@ class Entry(Widget):
 
     def __init__(self, parent):
         super().__init__(parent)
-        self._variable = tkinter.StringVar(self.base)
+        self._variable = backend.tk.StringVar(self.base)
         self._variable.trace_add("write", self._on_write)
-        self._entry = tkinter.Entry(self.base, textvariable=self._variable)
+        self._entry = backend.tk.Entry(self.base, textvariable=self._variable)
         self._entry.pack()
+        self._font: Font | None = None
         self.on_write: Callable[[Widget], None] | None = None
 
     def _on_write(self, *args):
         if self.on_write is None:
             return
-        self.on_write(self)
+        self._dispatch(self.on_write)
 
     @property
-    def font(self):
-        # TODO: return a sprout.Font instead of str
-        return self._entry.cget("font")
+    def font(self) -> Font | None:
+        return self._font
 
     @font.setter
     def font(self, font: Font):
-        self._entry.config(font=font.tkinter())
+        if font == self._font:
+            return
+        self._config(self._entry, font=font.tkinter())
+        self._font = font
 
     @property
     def value(self):
@@ -40,8 +44,8 @@ class Entry(Widget):
 
     @property
     def width(self):
-        return self._entry.cget("width")
+        return self._cget(self._entry, "width")
 
     @width.setter
     def width(self, width: int):
-        self._entry.config(width=width)
+        self._config(self._entry, width=width)
@@ -1,8 +1,15 @@
 import tkinter.font
 
+from sprout import backend
+
 
 class Font:
-    """Same as tkinter.font.Font."""
+    """
+    Same as tkinter.font.Font, but immutable.
+
+    Equal fonts share a single tkinter font, so creating the same Font
+    repeatedly doesn't register a new font with Tk each time.
+    """
 
     def __init__(
         self,
@@ -13,19 +20,69 @@ class Font:
         underline: bool = False,
         strikethrough: bool = False,
     ):
-        self.family = family
-        self.size = size
-        self.bold = bold
-        self.italic = italic
-        self.underline = underline
-        self.strikethrough = strikethrough
+        object.__setattr__(self, "family", family)
+        object.__setattr__(self, "size", size)
+        object.__setattr__(self, "bold", bold)
+        object.__setattr__(self, "italic", italic)
+        object.__setattr__(self, "underline", underline)
+        object.__setattr__(self, "strikethrough", strikethrough)
 
-    def tkinter(self):
-        return tkinter.font.Font(
-            family=self.family,
-            size=self.size,
-            weight=tkinter.font.BOLD if self.bold else tkinter.font.NORMAL,
-            slant=tkinter.font.ITALIC if self.italic else tkinter.font.ROMAN,
-            underline=self.underline,
-            overstrike=self.strikethrough,
+    def __setattr__(self, name, value):
+        raise AttributeError("Font is immutable")
+
+    def _key(self):
+        return (
+            self.family,
+            self.size,
+            self.bold,
+            self.italic,
+            self.underline,
+            self.strikethrough,
         )
+
+    def __eq__(self, other):
+        if not isinstance(other, Font):
+            return NotImplemented
+        return self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"Font{self._key()!r}"
+
+    def measure(self, text: str) -> int:
+        """Width of text in pixels."""
+        return self.tkinter().measure(text)
+
+    def tkinter(self):
+        font = _FONTS.get(self)
+        if font is None:
+            font = backend.font.Font(
+                family=self.family,
+                size=self.size,
+                weight=backend.font.BOLD if self.bold else backend.font.NORMAL,
+                slant=backend.font.ITALIC if self.italic else backend.font.ROMAN,
+                underline=self.underline,
+                overstrike=self.strikethrough,
+            )
+            _FONTS[self] = font
+        return font
+
+
+_FONTS: dict[Font, tkinter.font.Font] = {}
+
+
+def font_count():
+    """Number of tkinter fonts currently registered by Sprout."""
+    return len(_FONTS)
+
+
+def clear_fonts():
+    """
+    Forget all registered tkinter fonts.
+
+    Tk deletes each font once nothing else references it, so only call
+    this when widgets using the fonts are being torn down as well.
+    """
+    _FONTS.clear()
@@ -16,25 +16,25 @@ class Frame(Container):
     def _on_click(self, event: tkinter.Event):
         if self.on_click is None:
             return
-        self.on_click(self)
+        self._dispatch(self.on_click)
 
     @property
     def background_colour(self):
-        if self.base.cget("bg") == self.parent.base.cget("bg"):
+        if self._cget(self.base, "bg") == self._cget(self.parent.base, "bg"):
             return None
-        return self.base.cget("bg")
+        return self._cget(self.base, "bg")
 
     @background_colour.setter
     def background_colour(self, background_colour: str | None):
         if background_colour is None:
-            self.base.config(bg=self.parent.base.cget("bg"))
+            self._config(self.base, bg=self._cget(self.parent.base, "bg"))
         else:
-            self.base.config(bg=background_colour)
+            self._config(self.base, bg=background_colour)
 
     @property
     def border_width(self):
-        return self.base.cget("bd")
+        return self._cget(self.base, "bd")
 
     @border_width.setter
     def border_width(self, border_width: int):
-        self.base.config(bd=border_width)
+        self._config(self.base, bd=border_width)
@@ -0,0 +1,541 @@
+"""
+In-memory stand-in for the parts of tkinter Sprout uses.
+
+Nothing is drawn, but the widget tree, options, geometry and bindings
+are all tracked, so GUIs can be built and driven without a display.
+Timers run on a virtual clock: nothing happens until update() or
+advance() is called on the Tk object.
+
+Select it with sprout.use_backend("headless") (or by setting the
+SPROUT_BACKEND environment variable) before creating an Application.
+"""
+
+import heapq
+import itertools
+import struct
+import tkinter
+from typing import Callable
+
+
+TclError = tkinter.TclError
+"""tkinter's own, so code can catch it whichever backend is in use."""
+
+BOLD = "bold"
+NORMAL = "normal"
+ITALIC = "italic"
+ROMAN = "roman"
+
+_DEFAULTS = {
+    "bg": "#d9d9d9",
+    "fg": "#000000",
+    "bd": 0,
+    "font": "TkDefaultFont",
+    "text": "",
+    "image": "",
+    "width": 0,
+    "height": 0,
+}
+_ALIASES = {"background": "bg", "foreground": "fg", "borderwidth": "bd"}
+
+_names = itertools.count(1)
+
+
+def _bind(bindings: dict[str, Callable], sequence: str, func: Callable, add):
+    previous = bindings.get(sequence)
+    if add and previous is not None:
+
+        def both(event: Event):
+            if previous(event) == "break":
+                return "break"
+            return func(event)
+
+        bindings[sequence] = both
+    else:
+        bindings[sequence] = func
+
+
+class Event:
+
+    def __init__(self, widget: "Misc", x: int = 0, y: int = 0):
+        self.widget = widget
+        self.x = x
+        self.y = y
+
+
+class Misc:
+    """Base class for fake widgets."""
+
+    def __init__(self, master: "Misc | None" = None, **options):
+        self.master = master
+        self._name = f"!{type(self).__name__.lower()}{next(_names)}"
+        self.children: dict[str, Misc] = {}
+        self.options: dict[str, object] = {}
+        self.bindings: dict[str, Callable] = {}
+        self.manager: str | None = None
+        """Geometry manager in use: "pack", "place" or None."""
+        self.placement: dict[str, object] = {}
+        self.destroyed = False
+        if master is not None:
+            master.children[self._name] = self
+        self.config(**options)
+
+    def __str__(self):
+        if self.master is None:
+            return "."
+        parent = str(self.master)
+        return f"{'' if parent == '.' else parent}.{self._name}"
+
+    def _root(self) -> "Tk":
+        widget = self
+        while widget.master is not None:
+            widget = widget.master
+        return widget
+
+    def config(self, cnf: dict | None = None, **options):
+        for option, value in {**(cnf or {}), **options}.items():
+            self.options[_ALIASES.get(option, option)] = value
+
+    configure = config
+
+    def cget(self, option: str):
+        option = _ALIASES.get(option, option)
+        return self.options.get(option, _DEFAULTS.get(option, ""))
+
+    def bind(self, sequence: str, func: Callable, add: str | None = None):
+        _bind(self.bindings, sequence, func, add)
+
+    def bind_all(self, sequence: str, func: Callable, add: str | None = None):
+        _bind(self._root().all_bindings, sequence, func, add)
+
+    def unbind(self, sequence: str):
+        self.bindings.pop(sequence, None)
+
+    def event_generate(self, sequence: str, x: int = 0, y: int = 0):
+        # Same order as Tk's default bindtags, minus the class and toplevel
+        event = Event(self, x, y)
+        for bindings in (self.bindings, self._root().all_bindings):
+            func = bindings.get(sequence)
+            if func is not None and func(event) == "break":
+                return
+
+    def pack(self, **options):
+        self.manager = "pack"
+        self.placement = options
+
+    def place(self, **options):
+        self.manager = "place"
+        self.placement = options
+
+    def pack_forget(self):
+        if self.manager == "pack":
+            self.manager = None
+            self.placement = {}
+
+    def place_forget(self):
+        if self.manager == "place":
+            self.manager = None
+            self.placement = {}
+
+    def winfo_children(self):
+        return list(self.children.values())
+
+    def winfo_exists(self):
+        return not self.destroyed
+
+    def destroy(self):
+        for child in list(self.children.values()):
+            child.destroy()
+        if self.master is not None:
+            self.master.children.pop(self._name, None)
+        self.destroyed = True
+
+    def after(self, ms: int, func: Callable | None = None, *args):
+        return self._root().after(ms, func, *args)
+
+    def after_idle(self, func: Callable, *args):
+        return self._root().after_idle(func, *args)
+
+    def after_cancel(self, id: str):
+        self._root().after_cancel(id)
+
+
+class Tk(Misc):
+    """Root window, which also owns the virtual clock."""
+
+    def __init__(self):
+        self.all_bindings: dict[str, Callable] = {}
+        """Bindings made with bind_all()."""
+        super().__init__()
+        self.time = 0
+        """Virtual time in milliseconds."""
+        self._timers: list[tuple[int, int, str]] = []
+        self._idle: list[str] = []
+        self._callbacks: dict[str, tuple[Callable, tuple]] = {}
+        self._ids = itertools.count()
+        self._quit = False
+
+    def title(self, title: str | None = None):
+        if title is None:
+            return self.options.get("title", "")
+        self.options["title"] = title
+
+    def geometry(self, geometry: str | None = None):
+        if geometry is None:
+            return self.options.get("geometry", "")
+        self.options["geometry"] = geometry
+
+    def after(self, ms: int, func: Callable | None = None, *args):
+        if func is None:
+            self.advance(ms)
+            return None
+        n = next(self._ids)
+        id = f"after#{n}"
+        self._callbacks[id] = (func, args)
+        heapq.heappush(self._timers, (self.time + ms, n, id))
+        return id
+
+    def after_idle(self, func: Callable, *args):
+        id = f"after#{next(self._ids)}"
+        self._callbacks[id] = (func, args)
+        self._idle.append(id)
+        return id
+
+    def after_cancel(self, id: str):
+        self._callbacks.pop(id, None)
+
+    def _run(self, id: str):
+        callback = self._callbacks.pop(id, None)
+        if callback is not None:
+            func, args = callback
+            func(*args)
+
+    def update_idletasks(self):
+        while self._idle:
+            idle, self._idle = self._idle, []
+            for id in idle:
+                self._run(id)
+
+    def update(self):
+        """Run due timers and idle callbacks without advancing time."""
+        while self._timers and self._timers[0][0] <= self.time:
+            _, _, id = heapq.heappop(self._timers)
+            self._run(id)
+            self.update_idletasks()
+        self.update_idletasks()
+
+    def advance(self, ms: int):
+        """Move the virtual clock forward, running callbacks on the way."""
+        end = self.time + ms
+        self.update()
+        while self._timers and self._timers[0][0] <= end:
+            self.time = self._timers[0][0]
+            self.update()
+        self.time = end
+
+    def mainloop(self):
+        """Run callbacks, jumping the clock ahead, until none are left."""
+        self._quit = False
+        self.update()
+        while not self._quit and self._timers:
+            self.time = max(self.time, self._timers[0][0])
+            self.update()
+
+    def quit(self):
+        self._quit = True
+
+
+class Frame(Misc):
+    pass
+
+
+class Label(Misc):
+    pass
+
+
+class Scrollbar(Misc):
+
+    def set(self, first: float, last: float):
+        self.options["position"] = (float(first), float(last))
+
+    def get(self):
+        return self.options.get("position", (0.0, 1.0))
+
+
+class Entry(Misc):
+
+    def __init__(self, master: Misc | None = None, **options):
+        self._text = ""
+        super().__init__(master, **options)
+
+    def get(self):
+        variable = self.options.get("textvariable")
+        if variable is not None:
+            return variable.get()
+        return self._text
+
+    def insert(self, index, text: str):
+        self._set(self.get() + text)
+
+    def delete(self, first, last=None):
+        self._set("")
+
+    def _set(self, text: str):
+        variable = self.options.get("textvariable")
+        if variable is not None:
+            variable.set(text)
+        else:
+            self._text = text
+
+
+class OptionMenu(Misc):
+
+    def __init__(self, master: Misc, variable: "StringVar", value: str, *values):
+        super().__init__(master)
+        self.variable = variable
+        self.values = [value, *values]
+
+    def select(self, value: str):
+        assert value in self.values
+        self.variable.set(value)
+
+
+class Canvas(Misc):
+    """Canvas items are stored as (type, coords, options)."""
+
+    def __init__(self, master: Misc | None = None, **options):
+        super().__init__(master, **options)
+        self.items: dict[int, tuple[str, list[float], dict]] = {}
+        self._item_ids = itertools.count(1)
+        self._yview = 0.0
+
+    def _create(self, kind: str, coords, options: dict):
+        id = next(self._item_ids)
+        self.items[id] = (kind, [float(c) for c in coords], dict(options))
+        return id
+
+    def create_window(self, *coords, **options):
+        return self._create("window", coords, options)
+
+    def create_rectangle(self, *coords, **options):
+        return self._create("rectangle", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def coords(self, id: int, *coords):
+        if not coords:
+            return list(self.items[id][1])
+        self.items[id][1][:] = [float(c) for c in coords]
+
+    def itemconfig(self, id: int, **options):
+        self.items[id][2].update(options)
+
+    itemconfigure = itemconfig
+
+    def itemcget(self, id: int, option: str):
+        return self.items[id][2].get(option, "")
+
+    def delete(self, *ids):
+        if "all" in ids:
+            self.items.clear()
+        for id in ids:
+            self.items.pop(id, None)
+
+    def bbox(self, id: int):
+        kind, coords, options = self.items[id]
+        if kind == "rectangle":
+            return tuple(coords)
+        width = height = 0
+        if kind == "text" and isinstance(options.get("font"), Font):
+            font = options["font"]
+            width = font.measure(str(options.get("text", "")))
+            height = font.metrics("linespace")
+        elif kind == "image" and isinstance(options.get("image"), PhotoImage):
+            width = options["image"].width()
+            height = options["image"].height()
+        return _anchor_box(coords[0], coords[1], width, height, options)
+
+    def find_overlapping(self, x1: float, y1: float, x2: float, y2: float):
+        found = []
+        for id, (kind, coords, options) in self.items.items():
+            if options.get("state") == "hidden":
+                continue
+            ix1, iy1, ix2, iy2 = self.bbox(id)
+            if ix1 <= x2 and x1 <= ix2 and iy1 <= y2 and y1 <= iy2:
+                found.append(id)
+        return tuple(found)
+
+    def yview(self, *args):
+        if not args:
+            return (self._yview, self._yview)
+        if args[0] == "moveto":
+            self._yview = min(max(float(args[1]), 0.0), 1.0)
+        elif args[0] == "scroll":
+            region = self.cget("scrollregion") or (0, 0, 0, 1)
+            height = float(region[3]) - float(region[1])
+            step = float(args[1]) / max(height, 1)
+            if args[2] == "units":
+                step *= 10
+            else:
+                step *= float(self.cget("height") or 0)
+            self._yview = min(max(self._yview + step, 0.0), 1.0)
+        command = self.cget("yscrollcommand")
+        if command:
+            command(self._yview, self._yview)
+
+    def canvasy(self, y: float):
+        region = self.cget("scrollregion") or (0, 0, 0, 0)
+        return float(y) + self._yview * (float(region[3]) - float(region[1]))
+
+
+class StringVar:
+
+    def __init__(self, master: Misc | None = None, value: str = ""):
+        self._value = value
+        self._traces: list[Callable] = []
+
+    def get(self):
+        return self._value
+
+    def set(self, value: str):
+        self._value = value
+        for callback in list(self._traces):
+            callback("", "", "write")
+
+    def trace_add(self, mode: str, callback: Callable):
+        if mode == "write":
+            self._traces.append(callback)
+        return str(id(callback))
+
+
+class _Interpreter:
+    """Stands in for the Tcl interpreter. Commands do nothing."""
+
+    def call(self, *args):
+        return ""
+
+
+class PhotoImage:
+    """Only the size of the image is kept, read from the PNG header."""
+
+    tk = _Interpreter()
+
+    def __init__(
+        self,
+        file: str | None = None,
+        data: bytes | None = None,
+        width: int = 0,
+        height: int = 0,
+    ):
+        if file is not None:
+            with open(file, "rb") as f:
+                data = f.read(24)
+        if data is not None:
+            width, height = _png_size(data)
+        self._width = width
+        self._height = height
+        self.name = f"pyimage{next(_names)}"
+
+    def __str__(self):
+        return self.name
+
+    def width(self):
+        return self._width
+
+    def height(self):
+        return self._height
+
+    def subsample(self, x: int, y: int | str = ""):
+        if y == "":
+            y = x
+        return PhotoImage(width=-(-self._width // x), height=-(-self._height // y))
+
+    def zoom(self, x: int, y: int | str = ""):
+        if y == "":
+            y = x
+        return PhotoImage(width=self._width * x, height=self._height * y)
+
+
+class Font:
+
+    def __init__(self, **options):
+        self.options = options
+        self.name = f"font{next(_names)}"
+
+    def __str__(self):
+        return self.name
+
+    def cget(self, option: str):
+        return self.options[option]
+
+    def actual(self, option: str | None = None):
+        if option is None:
+            return dict(self.options)
+        return self.options[option]
+
+    def measure(self, text: str):
+        # Rough average glyph width, as nothing is actually rendered
+        return round(len(text) * abs(self.options.get("size", 10)) * 0.6)
+
+    def metrics(self, option: str):
+        size = abs(self.options.get("size", 10))
+        metrics = {
+            "ascent": round(size * 0.9),
+            "descent": round(size * 0.3),
+            "linespace": round(size * 1.2),
+        }
+        return metrics[option]
+
+
+def _anchor_box(x: float, y: float, width: int, height: int, options: dict):
+    """Bounding box of an item of the given size anchored at (x, y)."""
+    anchor = options.get("anchor", "center")
+    if "w" in anchor:
+        left = x
+    elif "e" in anchor:
+        left = x - width
+    else:
+        left = x - width / 2
+    if anchor.startswith("n"):
+        top = y
+    elif anchor.startswith("s"):
+        top = y - height
+    else:
+        top = y - height / 2
+    return (left, top, left + width, top + height)
+
+
+def _png_size(header: bytes):
+    if header[:8] != b"\x89PNG\r\n\x1a\n" or len(header) < 24:
+        # As Tk does for anything it has no image format for
+        raise TclError("couldn't recognize image data")
+    return struct.unpack(">II", header[16:24])
+
+
+def click_item(item):
+    """Simulate a left click in the middle of a Sprout canvas item."""
+    canvas = item.canvas
+    x1, y1, x2, y2 = canvas.base_canvas.bbox(item.id)
+    canvas.base_canvas.event_generate("<Button-1>", (x1 + x2) / 2, (y1 + y2) / 2)
+    canvas.application.tk.update()
+
+
+def click(widget):
+    """
+    Simulate a left click on a Sprout widget.
+
+    The click is delivered to whichever tkinter widget inside it has a
+    <Button-1> binding, the same one a real click would reach.
+    """
+    queue = [widget.base]
+    while queue:
+        tk_widget = queue.pop(0)
+        if "<Button-1>" in tk_widget.bindings:
+            tk_widget.event_generate("<Button-1>")
+            widget.application.tk.update()
+            return
+        queue.extend(tk_widget.children.values())
+    raise ValueError(f"{widget!r} has no click binding")
@@ -1,5 +1,9 @@
+from collections import OrderedDict
+import os
 import tkinter
 
+from sprout import backend
+
 
 class Image:
 
@@ -7,8 +11,23 @@ class Image:
         self.base = base
 
     @classmethod
-    def from_file(cls, filename: str):
-        return Image(tkinter.PhotoImage(file=filename))
+    def from_file(cls, filename: str, subsample: int = 1, zoom: int = 1):
+        """
+        Load an image from file, optionally scaled.
+
+        Images are shared through IMAGE_CACHE, so loading the same file
+        at the same scale twice only decodes it once. Don't modify the
+        returned image in place.
+        """
+        return IMAGE_CACHE.get(filename, subsample, zoom)
+
+    @property
+    def width(self) -> int:
+        return self.base.width()
+
+    @property
+    def height(self) -> int:
+        return self.base.height()
 
     def subsample(self, x: int, y: int | None = None):
         if y is None:
@@ -19,3 +38,107 @@ class Image:
         if y is None:
             y = x
         return Image(self.base.zoom(x=x, y=y))
+
+    def crop(self, x1: int, y1: int, x2: int, y2: int):
+        """New image copied from the region (x1, y1) to (x2, y2)."""
+        image = backend.tk.PhotoImage(width=x2 - x1, height=y2 - y1)
+        image.tk.call(image, "copy", self.base, "-from", x1, y1, x2, y2)
+        return Image(image)
+
+
+class ImageCache:
+    """
+    LRU cache of decoded images.
+
+    Entries are keyed by (filename, subsample, zoom, mtime), so editing
+    a file on disk invalidates its cached copies. Size is estimated as
+    4 bytes per pixel; least recently used entries are evicted once the
+    total exceeds max_bytes.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[Image, int]] = OrderedDict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(
+        self,
+        filename: str,
+        subsample: int = 1,
+        zoom: int = 1,
+        data: bytes | None = None,
+        mtime: float | None = None,
+    ):
+        """
+        Get an image, loading it if it's not cached.
+
+        data and mtime can be given if the file has already been read.
+        """
+        if mtime is None:
+            mtime = os.path.getmtime(filename)
+        key = (filename, subsample, zoom, mtime)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return entry[0]
+        self.misses += 1
+        image = self._load(filename, subsample, zoom, data, mtime)
+        n_bytes = image.width * image.height * 4
+        self._entries[key] = (image, n_bytes)
+        self.size += n_bytes
+        self._evict()
+        return image
+
+    def lookup(self, filename: str, subsample: int = 1, zoom: int = 1):
+        """Get an image only if it's already cached, otherwise None."""
+        try:
+            key = (filename, subsample, zoom, os.path.getmtime(filename))
+        except OSError:
+            return None
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def _load(
+        self,
+        filename: str,
+        subsample: int,
+        zoom: int,
+        data: bytes | None,
+        mtime: float,
+    ):
+        if subsample == 1 and zoom == 1:
+            if data is not None:
+                return Image(backend.tk.PhotoImage(data=data))
+            return Image(backend.tk.PhotoImage(file=filename))
+        # Scaled copies share the unscaled decode.
+        image = self.get(filename, data=data, mtime=mtime)
+        if subsample != 1:
+            image = image.subsample(subsample)
+        if zoom != 1:
+            image = image.zoom(zoom)
+        return image
+
+    def _evict(self):
+        # Always keep the most recent entry, even if it's over budget.
+        while self.size > self.max_bytes and len(self._entries) > 1:
+            _, (_, n_bytes) = self._entries.popitem(last=False)
+            self.size -= n_bytes
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+
+
+IMAGE_CACHE = ImageCache()
@@ -1,6 +1,7 @@
 import tkinter
 from typing import Callable
 
+from sprout import backend
 from sprout.image import Image
 from sprout.widget import Container, Widget
 
@@ -10,7 +11,7 @@ class ImageLabel(Widget):
 
     def __init__(self, parent: Container, image: Image):
         super().__init__(parent)
-        self._label = tkinter.Label(self.base, image=image.base)
+        self._label = backend.tk.Label(self.base, image=image.base)
         self._image = image
         self._label.bind("<Button-1>", self._on_click)
         self._label.pack()
@@ -19,28 +20,28 @@ class ImageLabel(Widget):
     def _on_click(self, event: tkinter.Event):
         if self.on_click is None:
             return
-        self.on_click(self)
+        self._dispatch(self.on_click)
 
     @property
     def border_colour(self):
-        if self.base.cget("bg") == self.parent.base.cget("bg"):
+        if self._cget(self.base, "bg") == self._cget(self.parent.base, "bg"):
             return None
-        return self.base.cget("bg")
+        return self._cget(self.base, "bg")
 
     @border_colour.setter
     def border_colour(self, border_colour: str | None):
         if border_colour is None:
-            self.base.config(bg=self.parent.base.cget("bg"))
+            self._config(self.base, bg=self._cget(self.parent.base, "bg"))
         else:
-            self.base.config(bg=border_colour)
+            self._config(self.base, bg=border_colour)
 
     @property
     def border_width(self):
-        return self.base.cget("bd")
+        return self._cget(self.base, "bd")
 
     @border_width.setter
     def border_width(self, border_width: int):
-        self.base.config(bd=border_width)
+        self._config(self.base, bd=border_width)
 
     @property
     def image(self):
@@ -48,5 +49,5 @@ class ImageLabel(Widget):
 
     @image.setter
     def image(self, image: Image):
-        self._label.config(image=image.base)
+        self._config(self._label, image=image.base)
         self._image = image
@@ -0,0 +1,96 @@
+import os
+import queue
+import sys
+import threading
+import tkinter
+from typing import Callable
+
+from sprout.image import IMAGE_CACHE, Image
+
+
+class ImageLoader:
+    """
+    Loads images without blocking the GUI.
+
+    Files are read on a worker thread. tkinter can only be used from
+    the thread running the event loop, so the images themselves are
+    created there, a few at a time between events, and passed to each
+    request's callback. Loaded images go into IMAGE_CACHE, so later
+    calls to Image.from_file() for the same file are free.
+
+    A file that can't be read or decoded is reported on stderr and its
+    callback isn't called; later loads carry on as normal.
+    """
+
+    def __init__(self, application, batch_size: int = 4, interval: int = 10):
+        self.application = application
+        self.batch_size = batch_size
+        self.interval = interval
+        self._requests: queue.Queue[tuple | None] = queue.Queue()
+        self._loaded: queue.Queue[tuple] = queue.Queue()
+        self._pending = 0
+        self._polling = False
+        self._thread = threading.Thread(target=self._read_files, daemon=True)
+        self._thread.start()
+
+    def load(
+        self,
+        filename: str,
+        callback: Callable[[Image], None],
+        subsample: int = 1,
+    ):
+        """Call callback with the image once it has been loaded."""
+        image = IMAGE_CACHE.lookup(filename, subsample)
+        if image is not None:
+            callback(image)
+            return
+        self._pending += 1
+        self._requests.put((filename, subsample, callback))
+        if not self._polling:
+            self._polling = True
+            self.application.tk.after(self.interval, self._poll)
+
+    def close(self):
+        self._requests.put(None)
+
+    def _read_files(self):
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+            filename, subsample, callback = request
+            try:
+                with open(filename, "rb") as file:
+                    data = file.read()
+                mtime = os.path.getmtime(filename)
+            except OSError:
+                data = None
+                mtime = 0
+            self._loaded.put((filename, subsample, callback, data, mtime))
+
+    def _poll(self):
+        try:
+            for _ in range(self.batch_size):
+                try:
+                    filename, subsample, callback, data, mtime = (
+                        self._loaded.get_nowait()
+                    )
+                except queue.Empty:
+                    break
+                self._pending -= 1
+                if data is None:
+                    continue
+                try:
+                    image = IMAGE_CACHE.get(filename, subsample, data=data, mtime=mtime)
+                    callback(image)
+                except (OSError, tkinter.TclError) as error:
+                    print(
+                        f"image loader: can't load {filename}: {error}",
+                        file=sys.stderr,
+                    )
+        finally:
+            # Even if a callback raised something else, or polling stops for good
+            if self._pending:
+                self.application.tk.after(self.interval, self._poll)
+            else:
+                self._polling = False
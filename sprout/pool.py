@@ -0,0 +1,32 @@
+from typing import Callable, Generic, TypeVar
+
+from sprout.widget import Widget
+
+
+W = TypeVar("W", bound=Widget)
+
+
+class Pool(Generic[W]):
+    """
+    Recycles widgets instead of destroying and recreating them.
+
+    tkinter widgets can't change parent, so a pool should only hand out
+    widgets belonging to one container. Released widgets are hidden
+    rather than destroyed; acquire() only calls factory when there are
+    no released widgets left to reuse.
+    """
+
+    def __init__(self, factory: Callable[[], W]):
+        self.factory = factory
+        self._free: list[W] = []
+        self.created = 0
+
+    def acquire(self) -> W:
+        if self._free:
+            return self._free.pop()
+        self.created += 1
+        return self.factory()
+
+    def release(self, widget: W):
+        widget.hide()
+        self._free.append(widget)
@@ -1,5 +1,6 @@
 import tkinter
 
+from sprout import backend
 from sprout.constants import NW
 from sprout.widget import Container
 
@@ -21,13 +22,13 @@ class ScrollableFrame(Container):
 
         super().__init__(parent)
 
-        self._scrollbar = tkinter.Scrollbar(
+        self._scrollbar = backend.tk.Scrollbar(
             self.base,
             orient=tkinter.VERTICAL,
         )
         self._scrollbar.pack(side=tkinter.RIGHT, fill=tkinter.Y)
 
-        self._canvas = tkinter.Canvas(
+        self._canvas = backend.tk.Canvas(
             self.base,
             bd=0,
             highlightthickness=0,
@@ -39,7 +40,7 @@ class ScrollableFrame(Container):
         self._canvas.pack(side=tkinter.LEFT, fill=tkinter.BOTH)
         self._scrollbar.config(command=self._canvas.yview)
 
-        self.frame = tkinter.Frame(
+        self.frame = backend.tk.Frame(
             self._canvas,
             width=inner_width,
             height=inner_height,
@@ -0,0 +1,133 @@
+import time
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from sprout.application import Application
+
+
+class Histogram:
+    """
+    Latencies in power-of-two buckets of microseconds.
+
+    Bucket i counts latencies from 2**i up to 2**(i + 1) microseconds
+    (bucket 0 also holds anything under a microsecond), so recording is
+    constant time and percentiles are accurate to within a factor of 2.
+    """
+
+    BUCKETS = 32
+
+    def __init__(self):
+        self.buckets = [0] * self.BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float):
+        micros = int(seconds * 1_000_000)
+        bucket = max(0, min(micros.bit_length() - 1, self.BUCKETS - 1))
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float):
+        """Upper bound (in seconds) of the bucket holding percentile p."""
+        if self.count == 0:
+            return 0.0
+        target = p / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.buckets):
+            seen += n
+            if seen >= target:
+                return min(2 ** (i + 1) / 1_000_000, self.max)
+        return self.max
+
+    def __str__(self):
+        return (
+            f"n={self.count} mean={self.mean * 1000:.2f}ms"
+            f" p50={self.percentile(50) * 1000:.2f}ms"
+            f" p99={self.percentile(99) * 1000:.2f}ms"
+            f" max={self.max * 1000:.2f}ms"
+        )
+
+
+class Stats:
+    """
+    Handler latencies and event loop lag for one Application.
+
+    Created by Application.enable_stats(). Every on_click/on_write
+    dispatch is timed into a histogram per handler, and a heartbeat
+    scheduled with after() measures how late the event loop runs it.
+    """
+
+    def __init__(self, application: "Application", heartbeat: int = 100):
+        self.application = application
+        self.handlers: dict[str, Histogram] = {}
+        self.lag = Histogram()
+        self.heartbeat = heartbeat
+        """Milliseconds between lag measurements."""
+        self._beat_id: str | None = None
+        self._dump_id: str | None = None
+        self._expected = 0.0
+
+    def dispatch(self, callback: Callable, *args):
+        """Call callback(*args), timing it."""
+        start = time.perf_counter()
+        try:
+            callback(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            name = getattr(callback, "__qualname__", None) or repr(callback)
+            histogram = self.handlers.get(name)
+            if histogram is None:
+                histogram = self.handlers[name] = Histogram()
+            histogram.add(elapsed)
+
+    def start(self):
+        self._schedule_beat()
+
+    def stop(self):
+        tk = self.application.tk
+        for id in (self._beat_id, self._dump_id):
+            if id is not None:
+                tk.after_cancel(id)
+        self._beat_id = None
+        self._dump_id = None
+
+    def _schedule_beat(self):
+        self._expected = time.perf_counter() + self.heartbeat / 1000
+        self._beat_id = self.application.tk.after(self.heartbeat, self._beat)
+
+    def _beat(self):
+        self.lag.add(max(0.0, time.perf_counter() - self._expected))
+        self._schedule_beat()
+
+    def dump_every(self, filename: str, interval: int = 10_000):
+        """Write report() to filename every interval milliseconds."""
+
+        def dump():
+            with open(filename, "w", encoding="utf-8") as file:
+                file.write(self.report())
+            self._dump_id = self.application.tk.after(interval, dump)
+
+        self._dump_id = self.application.tk.after(interval, dump)
+
+    def report(self):
+        """Slowest handlers first, then event loop lag."""
+        lines = []
+        by_total = sorted(
+            self.handlers.items(), key=lambda item: item[1].total, reverse=True
+        )
+        for name, histogram in by_total:
+            lines.append(f"{name}: {histogram}")
+        lines.append(f"event loop lag: {self.lag}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        self.handlers.clear()
+        self.lag = Histogram()
@@ -1,6 +1,7 @@
 import tkinter
 from typing import Callable
 
+from sprout import backend
 from sprout.font import Font
 from sprout.widget import Container, Widget
 
@@ -10,37 +11,40 @@ class TextLabel(Widget):
 
     def __init__(self, parent: Container, text: str):
         super().__init__(parent)
-        self._label = tkinter.Label(self.base, text=text)
+        self._label = backend.tk.Label(self.base, text=text)
         self._label.bind("<Button-1>", self._on_click)
         self._label.pack()
+        self._font: Font | None = None
         self.on_click: Callable[[Widget], None] | None = None
 
     def _on_click(self, event: tkinter.Event):
         if self.on_click is None:
             return
-        self.on_click(self)
+        self._dispatch(self.on_click)
 
     @property
     def colour(self):
-        return self._label.cget("fg")
+        return self._cget(self._label, "fg")
 
     @colour.setter
     def colour(self, colour: str):
-        self._label.config(fg=colour)
+        self._config(self._label, fg=colour)
 
     @property
-    def font(self):
-        # TODO: return a sprout.Font instead of str
-        return self._label.cget("font")
+    def font(self) -> Font | None:
+        return self._font
 
     @font.setter
     def font(self, font: Font):
-        self._label.config(font=font.tkinter())
+        if font == self._font:
+            return
+        self._config(self._label, font=font.tkinter())
+        self._font = font
 
     @property
     def text(self) -> str:
-        return self._label.cget("text")
+        return self._cget(self._label, "text")
 
     @text.setter
     def text(self, text: str):
-        self._label.config(text=text)
+        self._config(self._label, text=text)
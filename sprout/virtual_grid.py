@@ -0,0 +1,163 @@
+import math
+import tkinter
+from typing import Callable, Generic, Sequence, TypeVar
+
+from sprout import backend
+from sprout.constants import CENTRE
+from sprout.widget import Container, Widget
+
+
+W = TypeVar("W", bound=Widget)
+
+_WHEEL_STEP = 60
+"""Pixels scrolled per mouse wheel notch."""
+
+
+class VirtualGrid(Container, Generic[W]):
+    """
+    Scrollable grid that only creates widgets for the visible rows.
+
+    Any number of items can be shown. The grid creates just enough cells
+    (using create_cell) to cover the visible rows plus a few extra, and
+    as it scrolls, reuses cells by calling bind_cell with the item each
+    one should now show. Cells are centred in cell_width by cell_height
+    slots.
+
+    If items changes in place, refresh(start) rebinds just the visible
+    cells from the first item that changed, and update() just the cell
+    showing one item.
+    """
+
+    def __init__(
+        self,
+        parent: Container,
+        width: int,
+        height: int,
+        columns: int,
+        cell_width: int,
+        cell_height: int,
+        create_cell: Callable[[Container], W],
+        bind_cell: Callable[[W, object], None],
+        overscan: int = 1,
+    ):
+        super().__init__(parent)
+        self.width = width
+        self.height = height
+        self.columns = columns
+        self.cell_width = cell_width
+        self.cell_height = cell_height
+        self.create_cell = create_cell
+        self.bind_cell = bind_cell
+        self.offset = 0
+        """Pixels scrolled down from the top."""
+        self._items: Sequence = []
+
+        self._scrollbar = backend.tk.Scrollbar(self.base, orient=tkinter.VERTICAL)
+        self._scrollbar.pack(side=tkinter.RIGHT, fill=tkinter.Y)
+        self._scrollbar.config(command=self.yview)
+
+        self.frame = backend.tk.Frame(self.base, width=width, height=height)
+        self.frame.pack(side=tkinter.LEFT)
+        self._bind_wheel(self.frame)
+
+        n_rows = math.ceil(height / cell_height) + overscan
+        self.cells: list[W] = []
+        for _ in range(n_rows * columns):
+            cell = create_cell(self)
+            self._bind_wheel(cell.base)
+            self.cells.append(cell)
+        self._cell_items: list[int | None] = [None] * len(self.cells)
+        """Index of the item each cell is showing."""
+
+    @property
+    def items(self):
+        return self._items
+
+    @items.setter
+    def items(self, items: Sequence):
+        self._items = items
+        self.refresh()
+
+    @property
+    def bound_cells(self) -> list[W]:
+        """Cells currently showing an item, in item order."""
+        bound = [
+            (index, cell)
+            for index, cell in zip(self._cell_items, self.cells)
+            if index is not None
+        ]
+        return [cell for _, cell in sorted(bound, key=lambda pair: pair[0])]
+
+    @property
+    def content_height(self):
+        return math.ceil(len(self._items) / self.columns) * self.cell_height
+
+    def refresh(self, start: int = 0):
+        """Rebind visible cells showing items from start on."""
+        # -1 never matches an item, but still marks the cell as placed
+        self._cell_items = [
+            -1 if index is not None and index >= start else index
+            for index in self._cell_items
+        ]
+        self.scroll_to(self.offset)
+
+    def update(self, index: int):
+        """Rebind the cell showing the item at index, if it's visible."""
+        for cell, cell_item in zip(self.cells, self._cell_items):
+            if cell_item == index:
+                self.bind_cell(cell, self._items[index])
+
+    def scroll_to(self, offset: int):
+        max_offset = max(0, self.content_height - self.height)
+        self.offset = min(max(0, int(offset)), max_offset)
+        self._layout()
+        if self.content_height == 0:
+            self._scrollbar.set(0, 1)
+        else:
+            self._scrollbar.set(
+                self.offset / self.content_height,
+                (self.offset + self.height) / self.content_height,
+            )
+
+    def yview(self, *args):
+        """Scrollbar command, same as tkinter.Canvas.yview."""
+        if args[0] == "moveto":
+            self.scroll_to(float(args[1]) * self.content_height)
+        elif args[0] == "scroll":
+            step = _WHEEL_STEP if args[2] == "units" else self.height
+            self.scroll_to(self.offset + int(args[1]) * step)
+
+    def _layout(self):
+        n_cells = len(self.cells)
+        first = self.offset // self.cell_height * self.columns
+        for index in range(first, first + n_cells):
+            # A cell keeps its item for as long as it stays in view
+            slot = index % n_cells
+            cell = self.cells[slot]
+            if index >= len(self._items):
+                if self._cell_items[slot] is not None:
+                    cell.hide()
+                    self._cell_items[slot] = None
+                continue
+            if self._cell_items[slot] != index:
+                self.bind_cell(cell, self._items[index])
+                self._cell_items[slot] = index
+            row, column = divmod(index, self.columns)
+            cell.place(
+                x=column * self.cell_width + self.cell_width // 2,
+                y=row * self.cell_height + self.cell_height // 2 - self.offset,
+                anchor=CENTRE,
+            )
+
+    def _bind_wheel(self, widget: tkinter.Misc):
+        widget.bind("<MouseWheel>", self._on_wheel)
+        widget.bind("<Button-4>", self._on_wheel)
+        widget.bind("<Button-5>", self._on_wheel)
+        for child in widget.children.values():
+            self._bind_wheel(child)
+
+    def _on_wheel(self, event: tkinter.Event):
+        if getattr(event, "num", None) == 5 or getattr(event, "delta", 0) < 0:
+            self.scroll_to(self.offset + _WHEEL_STEP)
+        else:
+            self.scroll_to(self.offset - _WHEEL_STEP)
@@ -1,5 +1,7 @@
 import tkinter
+from typing import Callable
 
+from sprout import backend
 from sprout.constants import NW
 
 
@@ -8,7 +10,8 @@ class Widget:
 
     def __init__(self, parent: "Container"):
         self.parent = parent
-        self.base = tkinter.Frame(parent.frame)
+        self.application = parent.application
+        self.base = backend.tk.Frame(parent.frame)
         """
         The underlying tkinter widget.
         
@@ -17,14 +20,34 @@ class Widget:
         """
         self.parent.children.append(self)
 
+    def _config(self, widget: tkinter.Misc, **options):
+        self.application.config(widget, **options)
+
+    def _cget(self, widget: tkinter.Misc, option: str):
+        return self.application.cget(widget, option)
+
+    def _dispatch(self, callback: Callable[["Widget"], None]):
+        """Call an on_click/on_write handler, timing it if stats are enabled."""
+        stats = self.application.stats
+        if stats is None:
+            callback(self)
+        else:
+            stats.dispatch(callback, self)
+
     def pack(self, side: str = tkinter.LEFT):
         self.base.pack(side=side)
 
     def place(self, x: int, y: int, anchor: str = NW):
         self.base.place(x=x, y=y, anchor=anchor)
 
+    def hide(self):
+        """Remove from the layout without destroying, undoing pack/place."""
+        self.base.pack_forget()
+        self.base.place_forget()
+
     def destroy(self):
         self.parent.children.remove(self)
+        self.application.forget(self.base)
         self.base.destroy()
 
 
@@ -0,0 +1,66 @@
+import os
+import shutil
+
+import pytest
+
+import sprout as s
+
+from game.players import BLANK_PLAYER, PlayerChanges
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def application(tmp_path, monkeypatch):
+    shutil.copytree(os.path.join(ROOT, "assets"), tmp_path / "assets")
+    shutil.copytree(os.path.join(ROOT, "players"), tmp_path / "players")
+    monkeypatch.chdir(tmp_path)
+    s.use_backend("headless")
+    s.IMAGE_CACHE.clear()
+    from ui.application import Application
+
+    application = Application()
+    yield application
+    application.players_watcher.close()
+    application.journal.close()
+    application.icons.close()
+
+
+def assigned_task_view(application):
+    """A task view on a new mission, assigned to a player other than blank."""
+    for player in application.players_screen.players[:3]:
+        application.mission.players.add(player)
+    application.reset_mission(None)
+    mission_screen = application.mission_screen
+    mission_screen.add_single(None)
+    task_view = mission_screen.task_views[0]
+    while task_view.task.assignee is BLANK_PLAYER:
+        mission_screen.cycle_assignee(task_view, task_view.assignee_icon)
+    return task_view
+
+
+def test_assignee_replaced_with_garbage_shows_blank(application):
+    task_view = assigned_task_view(application)
+    player = task_view.task.assignee
+
+    with open(player.name, "wb") as file:
+        file.write(b"not a png")
+    application.update_players(PlayerChanges(added=[], removed=[], changed=[player]))
+
+    blank = application.icons.get(BLANK_PLAYER, task_view.ICON_SIZE)
+    assert task_view.task.assignee is player
+    assert task_view.assignee_icon.image is blank
+
+
+def test_removed_assignee_is_unassigned(application):
+    task_view = assigned_task_view(application)
+    player = task_view.task.assignee
+
+    os.remove(player.name)
+    application.update_players(PlayerChanges(added=[], removed=[player], changed=[]))
+
+    blank = application.icons.get(BLANK_PLAYER, task_view.ICON_SIZE)
+    assert player not in application.mission.players
+    assert task_view.task.assignee is BLANK_PLAYER
+    assert task_view.assignee_icon.image is blank
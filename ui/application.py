@@ -1,33 +1,187 @@
+import sys
+import time
+from typing import TYPE_CHECKING
+
+from game.journal import Journal
 from game.mission import Mission
-from game.players import BLANK_PLAYER
+from game.players import BLANK_PLAYER, PlayerChanges, PlayersWatcher
 
 import sprout as s
 
-from ui.mission_screen import MissionScreen
-from ui.players_screen import PlayersScreen
+if TYPE_CHECKING:
+    # Only needed with --history and --serve; sqlite3 and asyncio are slow
+    # to import
+    from game.store import Store
+    from game.sync import SyncServer
+
+
+PLAYERS_POLL_INTERVAL = 1000
+"""Milliseconds between checks of the players folder."""
 
 
 class Application(s.Application):
+    """
+    The crew v2 GUI.
+
+    Screens are only built the first time they're shown, so the players
+    screen can appear without waiting for the mission screen.
 
-    def __init__(self):
+    Changes to the mission are journaled as they happen, and the last
+    session is picked up where it left off on the next launch. Finished
+    missions are saved to store, if given, and the board is mirrored to
+    any browsers following server.
+
+    Icons added to, removed from or changed in the players folder are
+    picked up while running, without a restart.
+    """
+
+    def __init__(
+        self, store: "Store | None" = None, server: "SyncServer | None" = None
+    ):
         super().__init__("the crew v2", 1280, 800)
         self.mission = Mission()
+        self.store = store
+        self.server = server
+        self._publish_scheduled = False
+        self.journal = Journal()
+        slots = self.journal.restore(self.mission)
 
-        self.players_screen = PlayersScreen(self, self.mission)
-        self.mission_screen = MissionScreen(self, self.mission)
+        self._icons = None
+        self._players_screen = None
+        self._mission_screen = None
 
-        self.players_screen.continue_button.on_click = self.start_mission
+        self.players_watcher = PlayersWatcher()
+        self.tk.after(PLAYERS_POLL_INTERVAL, self._poll_players)
 
-        self.mission_screen.change_players_button.on_click = self.change_players
+        if slots is None:
+            self.change_screen(self.players_screen)
+        else:
+            self.mission_screen.resume(slots)
+            self.change_screen(self.mission_screen)
+            self.publish()
 
-        self.change_screen(self.players_screen)
+    @property
+    def icons(self):
+        if self._icons is None:
+            from ui.player_icons import PlayerIcons
+
+            self._icons = PlayerIcons(self)
+        return self._icons
+
+    @property
+    def players_screen(self):
+        if self._players_screen is None:
+            from ui.players_screen import PlayersScreen
+
+            self._players_screen = PlayersScreen(
+                self, self.mission, self.journal, self.icons
+            )
+            self._players_screen.continue_button.on_click = self.start_mission
+        return self._players_screen
+
+    @property
+    def mission_screen(self):
+        if self._mission_screen is None:
+            from ui.mission_screen import MissionScreen
+
+            self._mission_screen = MissionScreen(
+                self, self.mission, self.journal, self.icons
+            )
+            self._mission_screen.change_players_button.on_click = (
+                self.change_players
+            )
+            self._mission_screen.reset_button.on_click = self.reset_mission
+            self._mission_screen.on_change = self.publish
+        return self._mission_screen
 
     def start_mission(self, source: s.TextLabel):
-        for i, player in enumerate(self.mission.players):
-            player.index = i
-        BLANK_PLAYER.index = 99
-        self.mission_screen.reset()
+        self.reset_mission(source)
         self.change_screen(self.mission_screen)
 
+    def reset_mission(self, source: s.TextLabel):
+        if self.store is not None:
+            self.store.record(self.mission)
+        self.mission_screen.reset()
+
     def change_players(self, source: s.TextLabel):
         self.change_screen(self.players_screen)
+
+    def _poll_players(self):
+        self.tk.after(PLAYERS_POLL_INTERVAL, self._poll_players)
+        changes = self.players_watcher.poll()
+        if changes:
+            self.update_players(changes)
+
+    def update_players(self, changes: PlayerChanges):
+        """Apply changes to the players folder to everything showing players."""
+        if self._icons is not None:
+            self._icons.refresh(changes.added + changes.changed)
+        if self._players_screen is not None:
+            self._players_screen.update_players(changes)
+        if self._mission_screen is not None:
+            self._mission_screen.update_icons(changes.changed)
+
+        removed = [
+            player for player in changes.removed if player in self.mission.players
+        ]
+        if removed:
+            for player in removed:
+                self.mission.players.remove(player)
+            self.journal.append(
+                "players",
+                players=[
+                    player.id
+                    for player in self.mission.players
+                    if player is not BLANK_PLAYER
+                ],
+            )
+            if self._mission_screen is not None:
+                self._mission_screen.unassign(removed)
+                self.publish()
+
+    def publish(self):
+        """Send the board to the sync server once Tk is next idle."""
+        if self.server is None or self._publish_scheduled:
+            return
+        self._publish_scheduled = True
+        self.tk.after_idle(self._publish)
+
+    def _publish(self):
+        from game.sync import board_state
+
+        self._publish_scheduled = False
+        self.server.publish(board_state(self.mission, self.mission_screen.slots()))
+
+    def start(self):
+        try:
+            super().start()
+        finally:
+            self.players_watcher.close()
+            if self._icons is not None:
+                self._icons.close()
+            self.journal.close()
+            if self.server is not None:
+                self.server.close()
+            if self.store is not None:
+                # Saved again (replacing this) if it's resumed and finished later
+                self.store.record(self.mission)
+                self.store.close()
+
+    def report_startup(self, start: float, imported: float):
+        """
+        Print startup timings to stderr once the first frame is drawn.
+
+        start and imported are time.perf_counter() values from before
+        and after importing the application.
+        """
+
+        def report():
+            self.tk.update_idletasks()
+            drawn = time.perf_counter()
+            print(
+                f"import: {(imported - start) * 1000:.1f} ms,"
+                f" first frame: {(drawn - start) * 1000:.1f} ms",
+                file=sys.stderr,
+            )
+
+        self.tk.after_idle(report)
@@ -0,0 +1,110 @@
+from typing import NamedTuple
+
+from game.card import CARDS, Card
+
+import sprout as s
+
+
+DONE_COLOUR = "#4f4f4f"
+
+
+class CardFace(NamedTuple):
+    """How one card looks in one state, with its layout width."""
+
+    text: str
+    colour: str
+    font: s.Font
+    width: int
+
+
+class CardFaces:
+    """
+    Faces for all 37 task cards, normal and done, at one scale.
+
+    Every face is laid out (fonts registered, widths measured) once,
+    when first asked for at a scale, so drawing a card is a lookup.
+    Use card_faces() to share them.
+    """
+
+    def __init__(self, scale: float = 1.0):
+        self.scale = scale
+        size = round(80 * scale)
+        normal = s.Font("Sans Serif", size, strikethrough=False)
+        done = s.Font("Sans Serif", size, strikethrough=True)
+        self._faces: dict[tuple[int, bool], CardFace] = {}
+        for card in CARDS + (Card.special(),):
+            text = str(card)
+            width = normal.measure(text)
+            self._faces[card.code, False] = CardFace(
+                text, card.suit.colour, normal, width
+            )
+            self._faces[card.code, True] = CardFace(text, DONE_COLOUR, done, width)
+
+    def __len__(self):
+        return len(self._faces)
+
+    def get(self, card: Card, done: bool):
+        return self._faces[card.code, done]
+
+
+_CARD_FACES: dict[float, CardFaces] = {}
+
+
+def card_faces(scale: float = 1.0):
+    faces = _CARD_FACES.get(scale)
+    if faces is None:
+        faces = _CARD_FACES[scale] = CardFaces(scale)
+    return faces
+
+
+class CardSprite:
+    """
+    One card on a canvas: a text item for each face, one shown at a time.
+
+    Both items are configured when the card changes, so marking it done
+    or not just swaps which is visible, with no font change for Tk to
+    lay out again.
+    """
+
+    def __init__(self, canvas: s.Canvas, faces: CardFaces, owner: object):
+        self.faces = faces
+        self.card: Card | None = None
+        self.normal = canvas.text(0, 0, anchor=s.W)
+        self.done = canvas.text(0, 0, anchor=s.W)
+        for item in (self.normal, self.done):
+            item.owner = owner
+            item.role = "card"
+            item.hide()
+
+    @property
+    def width(self):
+        return 0 if self.card is None else self.faces.get(self.card, False).width
+
+    def show(self, card: Card, done: bool, x: float, y: float):
+        if card is not self.card:
+            self.card = card
+            for item, face in (
+                (self.normal, self.faces.get(card, False)),
+                (self.done, self.faces.get(card, True)),
+            ):
+                item.text = face.text
+                item.colour = face.colour
+                item.font = face.font
+        self.normal.move(x, y)
+        self.done.move(x, y)
+        self.set_done(done)
+
+    def set_done(self, done: bool):
+        if done:
+            self.normal.hide()
+            self.done.show()
+        else:
+            self.done.hide()
+            self.normal.show()
+
+    def hide(self):
+        self.normal.hide()
+        self.done.hide()
+
+    def __contains__(self, item: s.CanvasItem):
+        return item is self.normal or item is self.done
@@ -1,18 +1,51 @@
-from game.card import Card
+import threading
+from typing import Callable
+
+from game import difficulty
+from game.history import Board, History, SlotState
+from game.journal import SNAPSHOT_INTERVAL, Journal, mission_state
 from game.mission import Mission
+from game.player import Player
+from game.players import BLANK_PLAYER
 from game.task import Task
 
 import sprout as s
 
+from ui.card_faces import CardSprite, card_faces
+from ui.player_icons import PlayerIcons
+
+
+PLAY = "play"
+REARRANGE = "rearrange"
 
-class MissionScreen(s.Screen):
 
-    def __init__(self, parent: s.Application, mission: Mission):
+class MissionScreen(s.Screen):
+    """
+    The tasks for the current mission.
+
+    Tasks are drawn on one canvas (self.board) rather than built from
+    widgets. Clicks on them go to the screen's handlers, and what they
+    do depends on the mode: in PLAY, clicking a card marks it done and
+    clicking the assignee cycles through players; in REARRANGE,
+    clicking two tasks swaps them.
+    """
+
+    def __init__(
+        self,
+        parent: s.Application,
+        mission: Mission,
+        journal: Journal,
+        icons: PlayerIcons,
+    ):
         super().__init__(parent)
         self.mission = mission
+        self.journal = journal
+        self.icons = icons
 
-        self.rearrange_mode = False
-        self.selected_task_widget: TaskWidget | None = None
+        self.mode = PLAY
+        self.selected_task_view: TaskView | None = None
+        self.on_change: Callable[[], None] | None = None
+        """Called after any change to the tasks. To be set by application."""
 
         self.reset_button = s.TextLabel(self, "(reset)")
         self.reset_button.on_click = self.reset
@@ -38,98 +71,176 @@ class MissionScreen(s.Screen):
         # on_click to be set by application
         self.change_players_button.place(1230, 30, anchor=s.NE)
 
+        self.seed_label = s.TextLabel(self, "")
+        self.seed_label.place(1050, 30, anchor=s.NE)
+
+        self.estimate_button = s.TextLabel(self, "(estimate)")
+        self.estimate_button.on_click = self.estimate
+        self.estimate_button.place(30, 770, anchor=s.W)
+
+        self.estimate_label = s.TextLabel(self, "")
+        self.estimate_label.place(180, 770, anchor=s.W)
+
+        self._estimate_thread: threading.Thread | None = None
+        self._estimate_cancel = threading.Event()
+        self._estimate: difficulty.Estimate | None = None
+        self._estimate_revision = 0
+        self._revision = 0
+        """Bumped on every change to the tasks, to tell stale estimates."""
+
+        self.undo_button = s.TextLabel(self, "(undo)")
+        self.undo_button.on_click = self.undo
+        self.undo_button.place(1130, 770, anchor=s.E)
+
+        self.redo_button = s.TextLabel(self, "(redo)")
+        self.redo_button.on_click = self.redo
+        self.redo_button.place(1230, 770, anchor=s.E)
+
+        self.bind_key("<Control-z>", self.undo)
+        self.bind_key("<Control-y>", self.redo)
+        self.bind_key("<Control-Z>", self.redo)
+
         MAX_TASK_COUNT = 15
-        self.task_widgets = [TaskWidget(self) for _ in range(MAX_TASK_COUNT)]
-        for i, task_widget in enumerate(self.task_widgets):
+        self.board = s.Canvas(self, 1160, 660)
+        self.board.place(30, 90)
+        self.board.on_click = self._on_board_click
+        self.task_views: list[TaskView] = []
+        for i in range(MAX_TASK_COUNT):
             row = i // 3
             column = i % 3
-            task_widget.place(x=30 + column * 400, y=90 + row * 135)
+            self.task_views.append(
+                TaskView(self.board, self.icons, column * 400, row * 135)
+            )
+        self.handle(PLAY, "assignee", self.cycle_assignee)
+        self.handle(PLAY, "card", self.toggle_card)
+        for role in ("task", "assignee", "card"):
+            self.handle(REARRANGE, role, self.select_task)
+        self.history = History(self._board())
 
         for widget in self.children:
             if not isinstance(widget, s.TextLabel):
                 continue
             widget.font = s.Font("Sans Serif", 15)
 
+    @property
+    def rearrange_mode(self):
+        return self.mode == REARRANGE
+
     def _update(self):
         if self.rearrange_mode:
             self.rearrange_tasks_button.colour = "#f18519"
         else:
             self.rearrange_tasks_button.colour = "#ffffff"
-        for task_widget in self.task_widgets:
-            self._update_border(task_widget)
-            self._update_commands(task_widget)
+        for task_view in self.task_views:
+            self._update_border(task_view)
 
-    def _update_border(self, task_widget: "TaskWidget"):
+    def _update_border(self, task_view: "TaskView"):
         if not self.rearrange_mode:
-            task_widget.background_colour = None
-        elif task_widget == self.selected_task_widget:
-            task_widget.background_colour = "#f18519"
+            task_view.border_colour = None
+        elif task_view == self.selected_task_view:
+            task_view.border_colour = "#f18519"
         else:
-            task_widget.background_colour = "#d1d1d1"
+            task_view.border_colour = "#d1d1d1"
 
-    def _update_commands(self, task_widget: "TaskWidget"):
-        if not self.rearrange_mode:
-            task_widget.inner1.on_click = None
-            task_widget.inner2.on_click = None
-            if task_widget.assignee_icon is not None:
-                task_widget.assignee_icon.on_click = self.cycle_assignee
-            for card_widget in task_widget.card_widgets:
-                card_widget.on_click = card_widget.toggle_card
-        else:
-            task_widget.inner1.on_click = self.select_task
-            task_widget.inner2.on_click = self.select_task
-            if task_widget.assignee_icon is not None:
-                task_widget.assignee_icon.on_click = self.select_task
-            for card_widget in task_widget.card_widgets:
-                card_widget.on_click = self.select_task
+    def _on_board_click(self, item: s.CanvasItem):
+        self.dispatch(item.role, item.owner, item)
 
     def reset(self, source: s.TextLabel | None = None):
+        self._estimate_cancel.set()
+        self.estimate_label.text = ""
         self.mission.reset()
-        self.rearrange_mode = False
-        self.selected_task_widget = None
-        for task_widget in self.task_widgets:
-            task_widget.task = None
+        self.resume({})
+        self._record("reset", seed=self.mission.seed, play_id=self.mission.play_id)
+
+    def resume(self, slots: dict[int, Task]):
+        """Show mission's tasks, as restored by Journal.restore()."""
+        self.seed_label.text = f"seed {self.mission.seed}"
+        self.mode = PLAY
+        self.selected_task_view = None
+        for i, task_view in enumerate(self.task_views):
+            task_view.task = slots.get(i)
         self._update()
+        self.history.reset(self._board())
+
+    def _record(self, op: str, **fields):
+        """Log a change to the journal, compacting it every so often."""
+        self.journal.append(op, **fields)
+        self._tasks_changed()
+        if op == "reset" or self.journal.since_snapshot >= SNAPSHOT_INTERVAL:
+            self._snapshot()
+        if self.on_change is not None:
+            self.on_change()
+
+    def _tasks_changed(self):
+        self._revision += 1
+        if self._estimate_thread is not None:
+            # Its result would be for tasks that have since changed
+            self._estimate_cancel.set()
+            self.estimate_label.text = ""
+
+    def _snapshot(self):
+        self.journal.snapshot(mission_state(self.mission, self.slots()))
+
+    def slots(self):
+        """Tasks on screen, by position."""
+        return {
+            i: task_view.task
+            for i, task_view in enumerate(self.task_views)
+            if task_view.task is not None
+        }
+
+    def _board(self):
+        return Board.capture([task_view.task for task_view in self.task_views])
 
     def add_single(self, source: s.TextLabel):
-        task_widget = next(
-            (widget for widget in self.task_widgets if widget.task is None), None
+        slot = next(
+            (i for i, view in enumerate(self.task_views) if view.task is None),
+            None,
         )
-        if task_widget is None:
+        if slot is None:
             return
+        task_view = self.task_views[slot]
         self.mission.add_task(1)
-        task_widget.task = self.mission.tasks[-1]
-        self._update_border(task_widget)
-        self._update_commands(task_widget)
+        task_view.task = self.mission.tasks[-1]
+        self._update_border(task_view)
+        self.history.reset(self._board())
+        # After the task is shown, so a snapshot taken here includes it
+        self._record("add", slot=slot, cards=1)
 
     def add_double(self, source: s.TextLabel):
-        task_widget = next(
-            (widget for widget in self.task_widgets if widget.task is None), None
+        slot = next(
+            (i for i, view in enumerate(self.task_views) if view.task is None),
+            None,
         )
-        if task_widget is None:
+        if slot is None:
             return
+        task_view = self.task_views[slot]
         self.mission.add_task(2)
-        task_widget.task = self.mission.tasks[-1]
-        self._update_border(task_widget)
-        self._update_commands(task_widget)
+        task_view.task = self.mission.tasks[-1]
+        self._update_border(task_view)
+        self.history.reset(self._board())
+        self._record("add", slot=slot, cards=2)
 
     def add_special(self, source: s.TextLabel):
-        task_widget = next(
-            (widget for widget in self.task_widgets if widget.task is None), None
+        slot = next(
+            (i for i, view in enumerate(self.task_views) if view.task is None),
+            None,
         )
-        if task_widget is None:
+        if slot is None:
             return
+        task_view = self.task_views[slot]
         self.mission.add_special_task()
-        task_widget.task = self.mission.tasks[-1]
-        self._update_border(task_widget)
-        self._update_commands(task_widget)
+        task_view.task = self.mission.tasks[-1]
+        self._update_border(task_view)
+        self.history.reset(self._board())
+        self._record("special", slot=slot)
 
     def rearrange_tasks(self, source: s.TextLabel):
-        self.rearrange_mode = not self.rearrange_mode
-        self.selected_task_widget = None
+        self.mode = PLAY if self.rearrange_mode else REARRANGE
+        self.selected_task_view = None
         self._update()
 
-    def select_task(self, source: s.Widget):
+    def select_task(self, task_view: "TaskView", source: s.CanvasItem):
         """
         Select a task to swap.
 
@@ -137,50 +248,178 @@ class MissionScreen(s.Screen):
         Otherwise, swap the previously selected task with this one and
         clear selections.
         """
-        while source.parent != self:
-            source = source.parent
-        assert isinstance(source, TaskWidget)
-
-        if self.selected_task_widget is None:
-            self.selected_task_widget = source
-            self._update_border(source)
+        if self.selected_task_view is None:
+            self.selected_task_view = task_view
+            self._update_border(task_view)
         else:
-            widget1 = self.selected_task_widget
-            widget2 = source
-            task1 = widget1.task
-            task2 = widget2.task
-            widget1.task = task2
-            widget2.task = task1
-            self.selected_task_widget = None
-            self._update_border(widget1)
-            self._update_commands(widget1)
-            self._update_border(widget2)
-            self._update_commands(widget2)
-
-    def cycle_assignee(self, source: "AssigneeWidget"):
-        index = self.mission.players.index(source.task.assignee)
-        index += 1
-        index %= len(self.mission.players)
-        source.task.assignee = self.mission.players[index]
-        source.image = s.Image.from_file(source.task.assignee.name).subsample(2)
-
-
-class TaskWidget(s.Frame):
-
-    def __init__(self, parent: s.Container):
-        super().__init__(parent, 360, 120)
-        self._task: Task | None = None
-        self.border_width = 5
+            view1 = self.selected_task_view
+            view2 = task_view
+            task1 = view1.task
+            task2 = view2.task
+            view1.task = task2
+            view2.task = task1
+            slot1 = self.task_views.index(view1)
+            slot2 = self.task_views.index(view2)
+            self._record("swap", slots=[slot1, slot2])
+            self.history.push(self.history.board.swap(slot1, slot2))
+            self.selected_task_view = None
+            self._update_border(view1)
+            self._update_border(view2)
+
+    def estimate(self, source: s.TextLabel):
+        """
+        Estimate the chance of completing the current tasks.
 
-        # So that border displays correctly
-        self.inner1 = s.Frame(self, 350, 110)
-        self.inner1.place(0, 0)
+        Playouts run on a background thread (which farms them out to a
+        process pool) so Tk stays responsive. Clicking again cancels.
+        """
+        if self._estimate_thread is not None:
+            self._estimate_cancel.set()
+            return
+        players = [p for p in self.mission.players if p is not BLANK_PLAYER]
+        if not 3 <= len(players) <= 5:
+            self.estimate_label.text = "estimate needs 3-5 players"
+            return
+        tasks = difficulty.mission_tasks(self.mission)
+        self._estimate_revision = self._revision
+        self._estimate_cancel = threading.Event()
+        self._estimate_thread = threading.Thread(
+            target=self._run_estimate,
+            args=(len(players), tasks, self._estimate_cancel),
+            daemon=True,
+        )
+        self._estimate_thread.start()
+        self.estimate_label.text = "estimating... (click again to cancel)"
+        self.parent.tk.after(100, self._poll_estimate)
 
-        self.inner2 = s.Frame(self.inner1, 0, 0)
-        self.inner2.place(0, 0)
+    def _run_estimate(self, n_players: int, tasks: list, cancel: threading.Event):
+        self._estimate = difficulty.estimate(n_players, tasks, cancel=cancel)
 
-        self.assignee_icon: AssigneeWidget | None = None
-        self.card_widgets: list[CardWidget] = []
+    def _poll_estimate(self):
+        if self._estimate_thread.is_alive():
+            self.parent.tk.after(100, self._poll_estimate)
+            return
+        self._estimate_thread = None
+        if self._estimate_revision != self._revision:
+            # Tasks changed (or the mission was reset) while estimating
+            return
+        self.estimate_label.text = f"success: {self._estimate}"
+
+    def cycle_assignee(self, task_view: "TaskView", source: s.CanvasImage):
+        task = task_view.task
+        task.assignee = self.mission.players.next(task.assignee)
+        task_view.update_assignee()
+        slot = self.task_views.index(task_view)
+        self._record("assign", slot=slot, player=task.assignee.id)
+        self._push(slot)
+
+    def toggle_card(self, task_view: "TaskView", source: s.CanvasText):
+        index = task_view.card_index(source)
+        task_view.task.toggle_done(index)
+        task_view.update_card(index)
+        slot = self.task_views.index(task_view)
+        self._record("toggle", slot=slot, card=index)
+        self._push(slot)
+
+    def update_icons(self, players: list[Player]):
+        """Redraw the assignees with these players' icons."""
+        for task_view in self.task_views:
+            if task_view.task is not None and task_view.task.assignee in players:
+                task_view.update_assignee()
+
+    def unassign(self, players: list[Player]):
+        """
+        Give tasks assigned to these players (since removed) no assignee.
+
+        History starts again afterwards, so undo can't bring them back.
+        """
+        for slot, task_view in enumerate(self.task_views):
+            task = task_view.task
+            if task is not None and task.assignee in players:
+                task.assignee = BLANK_PLAYER
+                task_view.update_assignee()
+                self._record("assign", slot=slot, player=BLANK_PLAYER.id)
+        self.history.reset(self._board())
+
+    def _push(self, slot: int):
+        """Add a history step for a change to the task in slot."""
+        task = self.task_views[slot].task
+        self.history.push(self.history.board.set(slot, SlotState.of(task)))
+
+    def undo(self, source: s.TextLabel | None = None):
+        """
+        Undo the last toggle, assignee change or swap.
+
+        Adding a task starts a new history, as its cards have already
+        been dealt from the deck.
+        """
+        previous = self.history.board
+        board = self.history.undo()
+        if board is not None:
+            self._show_board(previous, board)
+
+    def redo(self, source: s.TextLabel | None = None):
+        previous = self.history.board
+        board = self.history.redo()
+        if board is not None:
+            self._show_board(previous, board)
+
+    def _show_board(self, previous: Board, board: Board):
+        if self.selected_task_view is not None:
+            selected = self.selected_task_view
+            self.selected_task_view = None
+            self._update_border(selected)
+        for slot in board.changed(previous):
+            state = board[slot]
+            task_view = self.task_views[slot]
+            task_view.task = None if state is None else state.restore()
+            self._update_border(task_view)
+        # Undo isn't a single record, so save the whole state instead
+        self._snapshot()
+        self._tasks_changed()
+        if self.on_change is not None:
+            self.on_change()
+
+
+class TaskView:
+    """
+    One task slot, drawn as items on the board canvas.
+
+    Items are created once, then moved, changed or hidden as the slot's
+    task changes. Each has this view as owner, and a role of "task" (the
+    slot itself), "assignee" or "card".
+    """
+
+    WIDTH = 360
+    HEIGHT = 120
+    BORDER = 5
+
+    ICON_SIZE = 64
+
+    def __init__(self, board: s.Canvas, icons: PlayerIcons, x: int, y: int):
+        self.board = board
+        self.icons = icons
+        self.x = x
+        self.y = y
+        self._task: Task | None = None
+
+        # The outline is centred on the rectangle's edges
+        inset = self.BORDER / 2
+        self.border = board.rect(
+            x + inset,
+            y + inset,
+            x + self.WIDTH - inset,
+            y + self.HEIGHT - inset,
+            fill=board.background_colour,
+            outline_width=self.BORDER,
+        )
+        self.border.owner = self
+        self.border.role = "task"
+
+        self.assignee_icon: s.CanvasImage | None = None
+        self.faces = card_faces()
+        self.card_sprites: list[CardSprite] = []
+        """One per card in the task, then any hidden spares."""
 
     @property
     def task(self):
@@ -189,57 +428,51 @@ class TaskWidget(s.Frame):
     @task.setter
     def task(self, task: Task | None):
         self._task = task
-        for widget in list(self.inner2.children):
-            widget.destroy()
-        self.assignee_icon = None
-        self.card_widgets.clear()
         if task is None:
+            if self.assignee_icon is not None:
+                self.assignee_icon.hide()
+            for card_sprite in self.card_sprites:
+                card_sprite.hide()
             return
-        self.assignee_icon = AssigneeWidget(self.inner2, task)
-        self.assignee_icon.pack()
-        self.card_widgets.extend(CardWidget(self.inner2, card) for card in task.cards)
-        for card_widget in self.card_widgets:
-            card_widget.pack()
-
-    @property
-    def border_colour(self):
-        return self.background_colour
-
-    @border_colour.setter
-    def border_colour(self, colour: str | None):
-        self.background_colour = colour
-
 
-class AssigneeWidget(s.ImageLabel):
-
-    def __init__(self, parent: s.Container, task: Task):
-        super().__init__(
-            parent,
-            s.Image.from_file(task.assignee.name).subsample(2),
-        )
-        self.task = task
+        left = self.x + self.BORDER
+        middle = self.y + self.HEIGHT / 2
+        image = self.icons.get(task.assignee, self.ICON_SIZE)
+        if self.assignee_icon is None:
+            self.assignee_icon = self.board.image(left, middle, image, anchor=s.W)
+            self.assignee_icon.owner = self
+            self.assignee_icon.role = "assignee"
+        else:
+            self.assignee_icon.image = image
+            self.assignee_icon.show()
+        left += image.width
+
+        while len(self.card_sprites) < len(task.cards):
+            self.card_sprites.append(CardSprite(self.board, self.faces, self))
+        for i, card_sprite in enumerate(self.card_sprites):
+            if i >= len(task.cards):
+                card_sprite.hide()
+                continue
+            card_sprite.show(task.cards[i], task.is_done(i), left, middle)
+            left += card_sprite.width
 
+    def update_assignee(self):
+        self.assignee_icon.image = self.icons.get(self._task.assignee, self.ICON_SIZE)
 
-class CardWidget(s.TextLabel):
+    def update_card(self, index: int):
+        self.card_sprites[index].set_done(self._task.is_done(index))
 
-    def __init__(self, parent: s.Container, card: Card):
-        super().__init__(parent, str(card))
-        self.card = card
+    def card_index(self, item: s.CanvasItem):
+        """Index of the card that item belongs to."""
+        for i, card_sprite in enumerate(self.card_sprites):
+            if item in card_sprite:
+                return i
+        raise ValueError(f"{item!r} is not a card in this task")
 
-        if self.card.done:
-            self.colour = "#4f4f4f"
-            self.font = s.Font("Sans Serif", 80, strikethrough=True)
-        else:
-            self.colour = self.card.suit.colour
-            self.font = s.Font("Sans Serif", 80, strikethrough=False)
-
-        self.on_click = self.toggle_card
+    @property
+    def border_colour(self):
+        return self.border.outline
 
-    def toggle_card(self, source: "CardWidget"):
-        self.card.done = not self.card.done
-        if self.card.done:
-            self.colour = "#4f4f4f"
-            self.font = s.Font("Sans Serif", 80, strikethrough=True)
-        else:
-            self.colour = self.card.suit.colour
-            self.font = s.Font("Sans Serif", 80, strikethrough=False)
+    @border_colour.setter
+    def border_colour(self, colour: str | None):
+        self.border.outline = colour
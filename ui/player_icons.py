@@ -0,0 +1,136 @@
+import sys
+import threading
+import tkinter
+from typing import Callable
+
+from game.player import Player
+from game.players import BLANK_PLAYER, PLAYERS_FOLDER, scan_players
+
+import sprout as s
+
+
+ATLAS_PATH = "cache/players.png"
+
+ICON_SIZES = (128, 64, 32)
+"""Sizes kept in the atlas. Player icons are 128x128 to start with."""
+
+BUILD_POLL_INTERVAL = 50
+"""Milliseconds between checks on whether the atlas is built."""
+
+
+class PlayerIcons:
+    """
+    Player icons at each of ICON_SIZES, cut from one atlas.
+
+    The atlas is brought up to date with the players folder on a worker
+    thread, which only repacks icons that were added or changed. Until
+    it's ready, or if it can't be built, icons are loaded from their
+    files instead. Icons that change while running are loaded from
+    their files too, until the atlas is next rebuilt.
+    """
+
+    def __init__(
+        self,
+        application: s.Application,
+        folder: str = PLAYERS_FOLDER,
+        path: str = ATLAS_PATH,
+    ):
+        self.application = application
+        self.folder = folder
+        self.path = path
+        self.atlas: s.Atlas | None = None
+        self._stale: set[str] = set()
+        """Icons whose files are newer than the atlas."""
+        self._loader: s.ImageLoader | None = None
+        self._build: threading.Thread | None = None
+        self._built: s.Atlas | Exception | None = None
+        self._changed_while_building: set[str] = set()
+        self.rebuild()
+
+    def rebuild(self):
+        """Start bringing the atlas up to date, unless that's underway."""
+        if self._build is not None:
+            return
+        self._changed_while_building.clear()
+        self._build = threading.Thread(target=self._build_atlas, daemon=True)
+        self._build.start()
+        self.application.tk.after(BUILD_POLL_INTERVAL, self._poll_build)
+
+    def _build_atlas(self):
+        try:
+            sources = [player.name for player in scan_players(self.folder)]
+            sources.append(BLANK_PLAYER.name)
+            s.build_atlas(sources, self.path, ICON_SIZES)
+            self._built = s.Atlas(self.path)
+        except (OSError, ValueError) as error:
+            self._built = error
+
+    def _poll_build(self):
+        if self._build.is_alive():
+            self.application.tk.after(BUILD_POLL_INTERVAL, self._poll_build)
+            return
+        self._build = None
+        built, self._built = self._built, None
+        if isinstance(built, Exception):
+            print(f"player icons: can't build atlas: {built}", file=sys.stderr)
+            return
+        self.atlas = built
+        # Icons changed before the build started are in the atlas now
+        self._stale = set(self._changed_while_building)
+
+    def refresh(self, players: list[Player]):
+        """Reload these players' icons from their files from now on."""
+        names = [player.name for player in players]
+        self._stale.update(names)
+        if self._build is not None:
+            self._changed_while_building.update(names)
+
+    def _from_atlas(self, player: Player, size: int):
+        """player's icon from the atlas, or None if it's not there (yet)."""
+        if self.atlas is None or player.name in self._stale:
+            return None
+        if player.name not in self.atlas:
+            return None
+        return self.atlas.image(player.name, size)
+
+    def get(self, player: Player, size: int = ICON_SIZES[0]):
+        image = self._from_atlas(player, size)
+        if image is not None:
+            return image
+        try:
+            return s.Image.from_file(player.name, subsample=ICON_SIZES[0] // size)
+        except OSError:
+            if player is BLANK_PLAYER:
+                raise
+            # Removed from the players folder, but still assigned to a task
+            if self.atlas is not None and player.name in self.atlas:
+                return self.atlas.image(player.name, size)
+        except tkinter.TclError:
+            if player is BLANK_PLAYER:
+                raise
+            # Not an image (say, corrupt, or still being copied in)
+        return self.get(BLANK_PLAYER, size)
+
+    def load(
+        self,
+        player: Player,
+        callback: Callable[[s.Image], None],
+        size: int = ICON_SIZES[0],
+    ):
+        """
+        Call callback with player's icon, without blocking.
+
+        From the atlas this is immediate. Otherwise the file is read on
+        a worker thread, and callback isn't called if it can't be.
+        """
+        image = self._from_atlas(player, size)
+        if image is not None:
+            callback(image)
+            return
+        if self._loader is None:
+            self._loader = s.ImageLoader(self.application)
+        self._loader.load(player.name, callback, subsample=ICON_SIZES[0] // size)
+
+    def close(self):
+        if self._loader is not None:
+            self._loader.close()
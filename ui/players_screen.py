@@ -1,37 +1,98 @@
+import bisect
+
+from game.journal import Journal
 from game.mission import Mission
 from game.player import Player
-from game.players import PLAYERS
+from game.players import BLANK_PLAYER, PlayerChanges, scan_players
 
 import sprout as s
 
+from ui.player_icons import PlayerIcons
+
 
 class PlayersScreen(s.Screen):
 
-    def __init__(self, parent: s.Application, mission: Mission):
+    def __init__(
+        self,
+        parent: s.Application,
+        mission: Mission,
+        journal: Journal,
+        icons: PlayerIcons,
+    ):
         super().__init__(parent)
         self.mission = mission
+        self.journal = journal
+        self.icons = icons
 
         self.select_players_label = s.TextLabel(self, "select players:")
         self.select_players_label.font = s.Font("Sans Serif", 15)
         self.select_players_label.place(x=640, y=50, anchor=s.N)
 
-        self.player_widgets = [PlayerWidget(self, player) for player in PLAYERS]
-        for i, player_widget in enumerate(self.player_widgets):
-            # TODO: make player screen scrollable to support more players
-            row = i // 6
-            column = i % 6
-            player_widget.place(
-                x=190 + column * 180,
-                y=200 + row * 180,
-                anchor=s.CENTRE,
-            )
+        # Shared with player_grid, which shows changes once refreshed
+        self.players = scan_players()
+        self.player_grid = s.VirtualGrid(
+            self,
+            width=1080,
+            height=540,
+            columns=6,
+            cell_width=180,
+            cell_height=180,
+            create_cell=self._create_player_widget,
+            bind_cell=self._bind_player_widget,
+        )
+        self.player_grid.place(x=640, y=110, anchor=s.N)
+        self.player_grid.items = self.players
 
         self.continue_button = s.TextLabel(self, "(continue)")
         self.continue_button.font = s.Font("Sans Serif", 15)
         self.continue_button.place(x=640, y=720, anchor=s.S)
 
-        for player_widget in self.player_widgets:
-            player_widget.on_click = self.select_player
+    @property
+    def player_widgets(self) -> list["PlayerWidget"]:
+        """Player widgets currently in use (not every player has one)."""
+        return self.player_grid.bound_cells
+
+    def _create_player_widget(self, parent: s.Container):
+        player_widget = PlayerWidget(parent, self.icons.get(BLANK_PLAYER))
+        player_widget.on_click = self.select_player
+        return player_widget
+
+    def _bind_player_widget(self, player_widget: "PlayerWidget", player: Player):
+        player_widget.player = player
+        if player in self.mission.players:
+            player_widget.show_border()
+        else:
+            player_widget.hide_border()
+        # Blank until the icon is loaded
+        player_widget.show_icon(self.icons.get(BLANK_PLAYER))
+
+        def show_icon(icon: s.Image):
+            # The widget may have been reused for another player since
+            if player_widget.player is player:
+                player_widget.show_icon(icon)
+
+        self.icons.load(player, show_icon)
+
+    def update_players(self, changes: PlayerChanges):
+        """Apply changes to the players folder, rebinding only what moved."""
+        first = len(self.players)
+        for player in changes.removed:
+            if player in self.players:
+                index = self.players.index(player)
+                del self.players[index]
+                first = min(first, index)
+        for player in changes.added:
+            if player not in self.players:
+                index = bisect.bisect(
+                    self.players, player.name, key=lambda player: player.name
+                )
+                self.players.insert(index, player)
+                first = min(first, index)
+        if changes.added or changes.removed:
+            self.player_grid.refresh(first)
+        for player in changes.changed:
+            if player in self.players:
+                self.player_grid.update(self.players.index(player))
 
     def select_player(self, source: "PlayerWidget"):
         player = source.player
@@ -39,18 +100,28 @@ class PlayersScreen(s.Screen):
             self.mission.players.remove(player)
             source.hide_border()
         else:
-            player.index = len(self.mission.players)
-            self.mission.players.append(player)
+            self.mission.players.add(player)
             source.show_border()
+        self.journal.append(
+            "players",
+            players=[
+                player.id
+                for player in self.mission.players
+                if player is not BLANK_PLAYER
+            ],
+        )
 
 
 class PlayerWidget(s.ImageLabel):
 
-    def __init__(self, parent: s.Container, player: Player):
-        super().__init__(parent, s.Image.from_file(player.name))
-        self.player = player
+    def __init__(self, parent: s.Container, icon: s.Image):
+        super().__init__(parent, icon)
+        self.player: Player | None = None
         self.border_width = 5
 
+    def show_icon(self, icon: s.Image):
+        self.image = icon
+
     def show_border(self):
         self.border_colour = "#f18519"
 